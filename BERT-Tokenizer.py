@@ -2,6 +2,18 @@
 
 # Handles both word-level and subword-level tokenization.
 
-from transformers import BertTokenizer
-tokenizer = BertTokenizer.from_pretrained('bert-base-uncased')
-tokens = tokenizer.tokenize("This is a sentence.")
+from functools import lru_cache
+from nlp_resources import OFFLINE
+
+@lru_cache(maxsize=None)
+def load_tokenizer(name='bert-base-uncased'):
+    # transformers is imported on first use; in offline mode only the local cache is used
+    from transformers import BertTokenizer
+    return BertTokenizer.from_pretrained(name, local_files_only=OFFLINE)
+
+def bert_tokenize(text, name='bert-base-uncased'):
+    return load_tokenizer(name).tokenize(text)
+
+if __name__ == "__main__":
+    tokens = bert_tokenize("This is a sentence.")
+    print(tokens)
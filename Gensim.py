@@ -6,13 +6,40 @@
 # commonly used alongside other tokenization libraries for various natural language processing tasks.
 # Simple and fast, often used in combination with other tokenization libraries.
 
-from gensim.utils import simple_preprocess
-from gensim.parsing.preprocessing import remove_stopwords
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+import gzip
 import logging
+import os
+import sys
+import time
+from tokenization_metrics import metrics, instrumented
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+@lru_cache(maxsize=None)
+def get_stopwords():
+    """
+    Gensim's stopword list as a frozenset, built once per process.
+    """
+    from gensim.parsing.preprocessing import STOPWORDS
+    return frozenset(STOPWORDS)
+
+def _tokenize(text, min_len, max_len, remove_stopwords_flag):
+    # gensim is imported on first use so importing this module stays cheap
+    from gensim.utils import simple_preprocess
+
+    # simple_preprocess needs an int upper bound; None means no maximum
+    tokens = simple_preprocess(text, min_len=min_len, max_len=sys.maxsize if max_len is None else max_len)
+    if remove_stopwords_flag:
+        stopwords = get_stopwords()
+        tokens = [token for token in tokens if token not in stopwords]
+    return tokens
+
+@instrumented("custom_tokenize")
 def custom_tokenize(text, min_len=1, max_len=None, remove_stopwords_flag=False):
     """
     Tokenize the input text with customizable options.
@@ -28,19 +55,115 @@ def custom_tokenize(text, min_len=1, max_len=None, remove_stopwords_flag=False):
         return []
     
     try:
-        tokens = simple_preprocess(text, min_len=min_len, max_len=max_len)
-        
-        if remove_stopwords_flag:
-            tokens = [token for token in tokens if token not in remove_stopwords(token)]
-        
-        logging.info(f"Tokenization completed. Number of tokens: {len(tokens)}")
+        tokens = _tokenize(text, min_len, max_len, remove_stopwords_flag)
+        logging.debug("Tokenization completed. Number of tokens: %d", len(tokens))
         return tokens
     except Exception as e:
+        metrics.record_error("custom_tokenize")
         logging.error(f"Error during tokenization: {str(e)}")
         return []
 
+def iter_line_documents(paths):
+    """
+    Yield one document per non-empty line of each text file in `paths` (.gz files are decompressed on the fly).
+
+    :param paths: A file path or a list of file paths
+    """
+    for path in [paths] if isinstance(paths, (str, os.PathLike)) else paths:
+        opener = gzip.open if str(path).endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
+
+def _tokenize_chunk(chunk, min_len, max_len, remove_stopwords_flag):
+    # Runs in a worker process; invalid or empty documents become empty token lists, as in custom_tokenize
+    return [_tokenize(text, min_len, max_len, remove_stopwords_flag) if isinstance(text, str) and text.strip() else []
+            for text in chunk]
+
+def tokenize_corpus(documents, min_len=1, max_len=None, remove_stopwords_flag=False, chunk_size=1000, n_workers=None, max_pending=None):
+    """
+    Tokenize a stream of documents across a process pool, yielding one token list per document in input order.
+    Only `max_pending` chunks are in flight at a time, so the corpus is never held in memory.
+
+    :param documents: Iterable of strings, or the path of a line-delimited text file
+    :param min_len: Minimum length of tokens to keep (default: 1)
+    :param max_len: Maximum length of tokens to keep (default: None)
+    :param remove_stopwords_flag: Whether to remove stopwords (default: False)
+    :param chunk_size: Documents per task sent to a worker (default: 1000)
+    :param n_workers: Worker processes (default: CPU count); 1 tokenizes in this process
+    :param max_pending: Chunks submitted ahead of the consumer (default: 2 * n_workers)
+    :return: Generator of token lists
+    """
+    if isinstance(documents, (str, os.PathLike)):
+        documents = iter_line_documents(documents)
+    documents = iter(documents)
+    chunks = iter(lambda: list(islice(documents, chunk_size)), [])
+    n_workers = n_workers or os.cpu_count() or 1
+    options = (min_len, max_len, remove_stopwords_flag)
+
+    if n_workers == 1:
+        for chunk in chunks:
+            start = time.perf_counter()
+            results = _tokenize_chunk(chunk, *options)
+            metrics.record("tokenize_corpus", sum(map(len, results)), time.perf_counter() - start, len(results))
+            yield from results
+        return
+
+    max_pending = max_pending or 2 * n_workers
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        pending = deque()
+        start = time.perf_counter()
+
+        def collect():
+            nonlocal start
+            results = pending.popleft().result()
+            now = time.perf_counter()
+            metrics.record("tokenize_corpus", sum(map(len, results)), now - start, len(results))
+            start = now
+            return results
+
+        for chunk in chunks:
+            pending.append(executor.submit(_tokenize_chunk, chunk, *options))
+            if len(pending) >= max_pending:
+                yield from collect()
+        while pending:
+            yield from collect()
+
+class TokenizedCorpus:
+    """
+    Restartable streamed corpus for Gensim: every iteration re-reads the documents and tokenizes them with
+    tokenize_corpus, so Word2Vec can make several passes and Dictionary can be built without holding the corpus.
+
+    :param documents: Re-iterable collection of strings (e.g. a list)
+    :param paths: Path or list of paths to line-delimited text files, used instead of `documents`
+    :param options: Keyword arguments for tokenize_corpus
+    """
+    def __init__(self, documents=None, paths=None, **options):
+        if (documents is None) == (paths is None):
+            raise ValueError("Pass exactly one of `documents` or `paths`.")
+        self.documents = documents
+        self.paths = paths
+        self.options = options
+
+    def __iter__(self):
+        documents = iter_line_documents(self.paths) if self.paths is not None else self.documents
+        return tokenize_corpus(documents, **self.options)
+
 # Example usage
-input_text = "This is a sentence."
-tokens = custom_tokenize(input_text, min_len=2, max_len=10, remove_stopwords_flag=True)
+if __name__ == "__main__":
+    input_text = "This is a sentence."
+    tokens = custom_tokenize(input_text, min_len=2, max_len=10, remove_stopwords_flag=True)
+
+    print(tokens)
+
+    from gensim.corpora import Dictionary
+    from gensim.models import Word2Vec
 
-print(tokens)
+    documents = ["The Nissan GT-R is known for its powerful twin-turbo V6 engine.",
+                 "Japanese sports cars like the Toyota Supra have a cult following."] * 1000
+    corpus = TokenizedCorpus(documents, remove_stopwords_flag=True, chunk_size=200)
+    dictionary = Dictionary(corpus)
+    model = Word2Vec(sentences=corpus, vector_size=32, min_count=1, workers=2, epochs=2)
+    print(len(dictionary), model.wv.most_similar("nissan", topn=3))
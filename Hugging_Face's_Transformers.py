@@ -3,7 +3,17 @@
 # Supports WordPiece, Byte Pair Encoding (BPE), and SentencePiece tokenization methods.
 
 # Handles subword tokenization, which is essential for transformer-based models.
-    
-from transformers import BertTokenizer
-tokenizer = BertTokenizer.from_pretrained('bert-base-uncased')
-tokens = tokenizer.tokenize("This is a sentence.")
+
+from functools import lru_cache
+from nlp_resources import OFFLINE
+
+@lru_cache(maxsize=None)
+def load_tokenizer(name='bert-base-uncased'):
+    # transformers is imported on first use; in offline mode only the local cache is used
+    from transformers import BertTokenizer
+    return BertTokenizer.from_pretrained(name, local_files_only=OFFLINE)
+
+if __name__ == "__main__":
+    tokenizer = load_tokenizer('bert-base-uncased')
+    tokens = tokenizer.tokenize("This is a sentence.")
+    print(tokens)
@@ -1,17 +1,20 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.preprocessing import StandardScaler, MinMaxScaler
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
 import re
 import logging
-import tkinter as tk
-from tkinter import ttk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from PIL import Image, ImageTk
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import io
+import json
 import os
+import sys
+import time
+
+# Plotting (matplotlib, seaborn), sklearn, NLTK and the GUI stack (tkinter, PIL) are imported where they are
+# used, so headless and chunked runs never pay for them.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from nlp_resources import ensure_nltk_resource, ensure_punkt
 
 
 # -------------------------------------------------------------------------------
@@ -22,38 +25,370 @@ import os
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Precompiled patterns shared by the row-wise and vectorized text cleaning paths
+NON_ALPHA_PATTERN = re.compile(r'[^a-zA-Z\s]', re.I | re.A)
+# word_tokenize splits contractions such as "cannot" -> "can not" even on letters-only text. This is the
+# letters-only subset of NLTKWordTokenizer.CONTRACTIONS2 folded into one pass that inserts the split point.
+CONTRACTION_PATTERN = re.compile(r'\b(can(?=not\b)|gim(?=me\b)|gon(?=na\b)|got(?=ta\b)|lem(?=me\b)|wan(?=na(?:\s|$)))', re.I)
+
+# Chunked (out-of-core) mode settings
+DATE_COLUMNS = {'Date/Time (PST)': '%d-%m-%Y %H:%M'}
+MEDIAN_SAMPLE_SIZE = 100_000
+
+# Column schema for the avalanche sensor export: compact dtypes, and -7999 marks a missing reading
+AVALANCHE_SCHEMA = {
+    'Date/Time (PST)': {'dtype': 'datetime', 'format': '%d-%m-%Y %H:%M'},
+    'Temperature (deg F)': {'dtype': 'float32', 'sentinels': [-7999]},
+    'Relative Humidity (%)': {'dtype': 'float32', 'sentinels': [-7999]},
+    'Total Snow Depth (")': {'dtype': 'float32', 'sentinels': [-7999]},
+    'Intermittent/Shot Snow (")': {'dtype': 'float32', 'sentinels': [-7999]},
+}
+
+EDA_DIR = os.path.join('NLP Enhancements', 'data_handling', 'eda_plots')
+
+# GUI resize settings
+RESIZE_DEBOUNCE_MS = 150
+RESIZE_BUCKET = 16
+RESIZE_CACHE_SIZE = 8
+PREVIEW_MAX_SIZE = 600
+
+def correlation_sums(values, shift):
+    """
+    Pairwise-complete sufficient statistics (n, sum_x, sum_xx, sum_xy) of the columns of a 2-D float array,
+    taken around a fixed `shift` per column. Sums from different row blocks with the same shift can be added.
+    """
+    mask = ~np.isnan(values)
+    weights = mask.astype(np.float64)
+    shifted = np.where(mask, values - shift, 0.0)
+    return {
+        'n': weights.T @ weights,
+        'sum_x': shifted.T @ weights,
+        'sum_xx': (shifted ** 2).T @ weights,
+        'sum_xy': shifted.T @ shifted,
+    }
+
+def correlation_from_sums(sums):
+    n, sum_x = sums['n'], sums['sum_x']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = sums['sum_xy'] - sum_x * sum_x.T / n
+        var_x = sums['sum_xx'] - sum_x ** 2 / n
+        corr = cov / np.sqrt(var_x * var_x.T)
+    corr[n < 2] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+def pairwise_correlation(values):
+    """
+    Pearson correlation of the columns of a 2-D float array using pairwise-complete observations, like
+    DataFrame.corr(), computed with matrix products instead of a Python loop over column pairs.
+    """
+    # Center on the column means first to keep the sums of squares well conditioned
+    return correlation_from_sums(correlation_sums(values, np.nanmean(values, axis=0)))
+
+def _file_sha256(path, checkpoint=None):
+    """
+    SHA-256 of a file, plus the digest of its first `checkpoint` bytes when given (for append detection).
+    """
+    digest = hashlib.sha256()
+    prefix_digest = None
+    with open(path, 'rb') as f:
+        if checkpoint is not None:
+            remaining = checkpoint
+            while remaining > 0:
+                block = f.read(min(1 << 20, remaining))
+                if not block:
+                    break
+                digest.update(block)
+                remaining -= len(block)
+            prefix_digest = digest.hexdigest()
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest(), prefix_digest
+
+def _column_hash(series, start=0):
+    """
+    Order-aware hash of a column that can be extended when rows are appended (row hashes are summed mod 2**64).
+    """
+    series = pd.Series(series.to_numpy(), index=pd.RangeIndex(start, start + len(series)))
+    return int(pd.util.hash_pandas_object(series, index=True).to_numpy().sum(dtype=np.uint64))
+
+def _column_state(values, bins):
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return {'count': 0, 'mean': 0.0, 'm2': 0.0, 'min': None, 'max': None, 'counts': [], 'edges': []}
+    counts, edges = np.histogram(values, bins=bins)
+    return {
+        'count': int(len(values)),
+        'mean': float(values.mean()),
+        'm2': float(((values - values.mean()) ** 2).sum()),
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'counts': counts.tolist(),
+        'edges': edges.tolist(),
+    }
+
+def _column_slug(column):
+    return re.sub(r'[^A-Za-z0-9]+', '_', column).strip('_')
+
+def _render_histogram(column, counts, edges, path):
+    # Uses the Agg canvas directly, so workers never touch pyplot state or a GUI backend
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(6, 4))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.stairs(counts, edges, fill=True)
+    ax.set_title(f'Histogram of {column}')
+    fig.tight_layout()
+    fig.savefig(path)
+    return path
+
+def _render_heatmap(columns, corr, path):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(12, 10))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    image = ax.imshow(corr, cmap='coolwarm', vmin=-1, vmax=1)
+    fig.colorbar(image, ax=ax)
+    ax.set_xticks(range(len(columns)), labels=columns, rotation=45, ha='right')
+    ax.set_yticks(range(len(columns)), labels=columns)
+    if len(columns) <= 30:
+        for i in range(len(columns)):
+            for j in range(len(columns)):
+                ax.text(j, i, f'{corr[i, j]:.2f}', ha='center', va='center')
+    ax.set_title('Correlation Heatmap')
+    fig.tight_layout()
+    fig.savefig(path)
+    return path
+
 class DataPreprocessor:
-    def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
+    def __init__(self, schema=None):
+        self._stop_words = None
+        self.stop_words_pattern = None
         self.scaler = None
+        self.schema = schema
+
+    @property
+    def stop_words(self):
+        # Loaded on first text-cleaning call rather than at construction
+        if self._stop_words is None:
+            ensure_nltk_resource('corpora/stopwords')
+            from nltk.corpus import stopwords
+            self._stop_words = set(stopwords.words('english'))
+        return self._stop_words
+
+    def read_csv_options(self, file_path, schema=None):
+        """
+        Translate a column schema into read_csv options so dtypes and sentinel-to-NaN conversion are applied
+        by the parser itself. Without a schema, numeric columns are inferred from a sample and downcast to float32.
+        """
+        schema = schema or self.schema
+        if schema is None:
+            sample = pd.read_csv(file_path, nrows=1000)
+            schema = {col: {'dtype': 'float32'} for col in sample.select_dtypes(include=[np.number]).columns}
+            schema.update({col: {'dtype': 'datetime', 'format': date_format}
+                           for col, date_format in DATE_COLUMNS.items() if col in sample.columns})
+
+        dtypes, na_values, parse_dates, date_formats = {}, {}, [], {}
+        for col, spec in schema.items():
+            if spec.get('dtype') == 'datetime':
+                parse_dates.append(col)
+                if 'format' in spec:
+                    date_formats[col] = spec['format']
+            elif 'dtype' in spec:
+                dtypes[col] = spec['dtype']
+            if spec.get('sentinels'):
+                na_values[col] = spec['sentinels']
+
+        return {'dtype': dtypes, 'na_values': na_values, 'parse_dates': parse_dates, 'date_format': date_formats or None}
 
-    def load_data(self, file_path):
+    def load_data(self, file_path, schema=None):
         """
-        Load data from a CSV file.
+        Load data from a CSV file, applying the column schema (dtypes, sentinel values) when one is set.
         """
         try:
-            df = pd.read_csv(file_path)
+            if schema or self.schema:
+                df = pd.read_csv(file_path, **self.read_csv_options(file_path, schema))
+            else:
+                df = pd.read_csv(file_path)
             logging.info(f"Data loaded successfully. Shape: {df.shape}")
             return df
         except Exception as e:
             logging.error(f"Error loading data: {str(e)}")
             return None
 
+    def read_csv_chunks(self, file_path, chunksize=100_000, schema=None):
+        """
+        Stream a CSV in chunks with compact dtypes, parsed dates and sentinels converted to NaN.
+        """
+        yield from pd.read_csv(file_path, chunksize=chunksize, **self.read_csv_options(file_path, schema))
+
+    def compute_chunked_statistics(self, file_path, chunksize=100_000, strategy='mean', seed=0):
+        """
+        First pass of chunked mode: accumulate count, mean, variance, min/max and an approximate median per
+        numeric column without holding more than one chunk in memory. Means and variances are merged across
+        chunks with Chan's parallel update; medians come from a bounded bottom-k random sample.
+        """
+        rng = np.random.default_rng(seed)
+        stats = None
+
+        for chunk in self.read_csv_chunks(file_path, chunksize):
+            if strategy not in ('mean', 'median'):
+                chunk = chunk.dropna()
+            numeric = chunk.select_dtypes(include=[np.number]).astype(np.float64)
+
+            if stats is None:
+                columns = numeric.columns
+                stats = {
+                    'columns': list(columns),
+                    'rows': 0,
+                    'count': np.zeros(len(columns)),
+                    'mean': np.zeros(len(columns)),
+                    'm2': np.zeros(len(columns)),
+                    'min': np.full(len(columns), np.inf),
+                    'max': np.full(len(columns), -np.inf),
+                    'sample': {col: (np.empty(0), np.empty(0)) for col in columns},
+                }
+
+            stats['rows'] += len(numeric)
+            values = numeric.to_numpy()
+            count = np.sum(~np.isnan(values), axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = np.where(count > 0, np.nansum(values, axis=0) / np.maximum(count, 1), 0.0)
+                m2 = np.nansum((values - mean) ** 2, axis=0)
+            self._merge_moments(stats, count, mean, m2)
+            if count.any():
+                stats['min'] = np.fmin(stats['min'], np.nanmin(np.where(count > 0, values, np.inf), axis=0))
+                stats['max'] = np.fmax(stats['max'], np.nanmax(np.where(count > 0, values, -np.inf), axis=0))
+
+            # Bottom-k sampling: keep the values with the k smallest random keys seen so far
+            for idx, col in enumerate(stats['columns']):
+                column_values = values[:, idx]
+                column_values = column_values[~np.isnan(column_values)]
+                keys, sample = stats['sample'][col]
+                keys = np.concatenate([keys, rng.random(len(column_values))])
+                sample = np.concatenate([sample, column_values])
+                if len(keys) > MEDIAN_SAMPLE_SIZE:
+                    keep = np.argpartition(keys, MEDIAN_SAMPLE_SIZE)[:MEDIAN_SAMPLE_SIZE]
+                    keys, sample = keys[keep], sample[keep]
+                stats['sample'][col] = (keys, sample)
+
+        if stats is None:
+            raise ValueError(f"No rows found in '{file_path}'.")
+
+        stats['median'] = np.array([np.median(stats['sample'][col][1]) if len(stats['sample'][col][1]) else np.nan
+                                    for col in stats['columns']])
+        del stats['sample']
+        logging.info(f"Chunked statistics computed over {stats['rows']} rows and {len(stats['columns'])} numeric columns")
+        return stats
+
+    @staticmethod
+    def _merge_moments(stats, count, mean, m2):
+        total = stats['count'] + count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = mean - stats['mean']
+            stats['mean'] = np.where(total > 0, stats['mean'] + delta * count / total, 0.0)
+            stats['m2'] = stats['m2'] + m2 + np.where(total > 0, delta ** 2 * stats['count'] * count / total, 0.0)
+        stats['count'] = total
+
+    def preprocess_chunked(self, input_path, output_path, chunksize=100_000, strategy='mean', method='standard'):
+        """
+        Two-pass out-of-core preprocessing: statistics are gathered in a first streaming pass, then each chunk
+        is filled, scaled and appended to `output_path` (CSV, or Parquet when it ends in .parquet).
+        Matches handle_missing_values + scale_features on the full frame, with peak memory bounded by chunksize.
+        """
+        if strategy == 'mode':
+            raise ValueError("The 'mode' strategy needs exact value counts and is not supported in chunked mode.")
+
+        stats = self.compute_chunked_statistics(input_path, chunksize, strategy)
+        columns = stats['columns']
+
+        # Statistics of each column after filling its missing values, as the in-memory path would see them
+        fill = stats['mean'] if strategy == 'mean' else stats['median']
+        mean, m2 = stats['mean'].copy(), stats['m2'].copy()
+        missing = stats['rows'] - stats['count']
+        if strategy in ('mean', 'median'):
+            filled = {'count': stats['count'].copy(), 'mean': mean, 'm2': m2}
+            self._merge_moments(filled, missing, fill, np.zeros(len(columns)))
+            mean, m2 = filled['mean'], filled['m2']
+            col_min, col_max = np.fmin(stats['min'], fill), np.fmax(stats['max'], fill)
+        else:
+            col_min, col_max = stats['min'], stats['max']
+
+        if method == 'minmax':
+            offset, scale = col_min, col_max - col_min
+        else:
+            if method != 'standard':
+                logging.warning("Invalid scaling method. Using StandardScaler.")
+            offset, scale = mean, np.sqrt(m2 / max(stats['rows'], 1))
+        scale = np.where(scale == 0, 1.0, scale)  # sklearn leaves constant columns unscaled
+
+        writer = None
+        rows_written = 0
+        try:
+            for chunk in self.read_csv_chunks(input_path, chunksize):
+                if strategy in ('mean', 'median'):
+                    chunk[columns] = chunk[columns].fillna(dict(zip(columns, fill.astype(np.float32))))
+                else:
+                    chunk = chunk.dropna()
+                chunk[columns] = ((chunk[columns] - offset.astype(np.float32)) / scale.astype(np.float32)).astype(np.float32)
+
+                if output_path.endswith('.parquet'):
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(output_path, table.schema)
+                    writer.write_table(table)
+                else:
+                    chunk.to_csv(output_path, mode='w' if rows_written == 0 else 'a', header=rows_written == 0, index=False)
+                rows_written += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        logging.info(f"Chunked preprocessing completed. {rows_written} rows written to '{output_path}'")
+        return stats
+
     def clean_text(self, text):
         """
         Clean text data by removing special characters, numbers, and converting to lowercase.
         """
-        text = re.sub(r'[^a-zA-Z\s]', '', text, re.I|re.A)
+        text = NON_ALPHA_PATTERN.sub('', text)
         text = text.lower()
         return text
 
+    def clean_text_series(self, series):
+        """
+        Vectorized clean_text over a pandas Series of strings.
+        """
+        return series.str.replace(NON_ALPHA_PATTERN, '', regex=True).str.lower()
+
     def remove_stopwords(self, text):
         """
         Remove stopwords from the text.
         """
+        ensure_punkt()
+        from nltk.tokenize import word_tokenize
         tokens = word_tokenize(text)
         return ' '.join([token for token in tokens if token not in self.stop_words])
 
+    def remove_stopwords_series(self, series):
+        """
+        Vectorized remove_stopwords over a pandas Series of cleaned (letters and whitespace only) strings.
+        """
+        if self.stop_words_pattern is None:
+            # Tokens are pure letter runs here, so word boundaries coincide with token boundaries
+            alternatives = '|'.join(sorted(map(re.escape, self.stop_words), key=len, reverse=True))
+            self.stop_words_pattern = re.compile(rf'\b(?:{alternatives})\b')
+
+        dtype = series.dtype
+        series = series.str.replace(CONTRACTION_PATTERN, r'\1 ', regex=True)
+        series = series.str.replace(self.stop_words_pattern, '', regex=True)
+        return series.str.split().str.join(' ').astype(dtype)
+
     def handle_missing_values(self, df, strategy='mean'):
         """
         Handle missing values in the dataframe.
@@ -71,6 +406,8 @@ class DataPreprocessor:
         """
         Scale numerical features.
         """
+        from sklearn.preprocessing import StandardScaler, MinMaxScaler
+
         if method == 'standard':
             self.scaler = StandardScaler()
         elif method == 'minmax':
@@ -87,14 +424,19 @@ class DataPreprocessor:
         """
         Perform basic Exploratory Data Analysis (EDA) and create visualizations.
         """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         logging.info("Performing Exploratory Data Analysis")
         
         # Create directories for saving plots
-        eda_dir = os.path.join('NLP Enhancements', 'data_handling', 'eda_plots')
+        eda_dir = EDA_DIR
         os.makedirs(eda_dir, exist_ok=True)
         
         # Display basic information about the dataset
-        info_str = df.info(memory_usage='deep')
+        buffer = io.StringIO()
+        df.info(buf=buffer, memory_usage='deep')
+        info_str = buffer.getvalue()
         desc_str = df.describe().to_string()
         
         # Plot histograms for numerical columns
@@ -120,9 +462,206 @@ class DataPreprocessor:
         
         return info_str, desc_str
 
-    def preprocess_data(self, df, text_column=None):
+    def perform_eda_headless(self, df, eda_dir=EDA_DIR, sample_rows=None, bins=30, max_workers=None, seed=0):
+        """
+        Headless EDA for wide frames: histogram bins and correlation are computed with NumPy (optionally on a
+        row sample), per-column PNGs and the heatmap are rendered with Agg in a process pool, and all
+        statistics are written to eda_summary.json next to the plots.
+        """
+        logging.info("Performing headless Exploratory Data Analysis")
+        os.makedirs(eda_dir, exist_ok=True)
+
+        buffer = io.StringIO()
+        df.info(buf=buffer, memory_usage='deep')
+        info_str = buffer.getvalue()
+
+        numeric = df.select_dtypes(include=[np.number])
+        if sample_rows and len(numeric) > sample_rows:
+            numeric = numeric.sample(n=sample_rows, random_state=seed)
+        columns = list(numeric.columns)
+        values = numeric.to_numpy(dtype=np.float64)
+
+        summary = {'rows': len(df), 'sampled_rows': len(numeric), 'columns': {}, 'correlation': {}}
+        jobs = []
+        for idx, col in enumerate(columns):
+            column_values = values[:, idx]
+            column_values = column_values[~np.isnan(column_values)]
+            if len(column_values) == 0:
+                summary['columns'][col] = {'count': 0}
+                continue
+            counts, edges = np.histogram(column_values, bins=bins)
+            q25, q50, q75 = np.percentile(column_values, [25, 50, 75])
+            summary['columns'][col] = {
+                'count': int(len(column_values)),
+                'mean': float(column_values.mean()),
+                'std': float(column_values.std(ddof=1)) if len(column_values) > 1 else None,
+                'min': float(column_values.min()),
+                '25%': float(q25),
+                '50%': float(q50),
+                '75%': float(q75),
+                'max': float(column_values.max()),
+                'histogram': {'counts': counts.tolist(), 'edges': edges.tolist()},
+            }
+            jobs.append((_render_histogram, col, counts, edges, os.path.join(eda_dir, f'histogram_{_column_slug(col)}.png')))
+
+        corr = pairwise_correlation(values)
+        summary['correlation'] = {col: {other: (None if np.isnan(corr[i, j]) else float(corr[i, j]))
+                                        for j, other in enumerate(columns)} for i, col in enumerate(columns)}
+        jobs.append((_render_heatmap, columns, corr, os.path.join(eda_dir, 'correlation_heatmap.png')))
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(job[0], *job[1:]) for job in jobs]
+            plots = [future.result() for future in futures]
+        summary['plots'] = plots
+
+        with open(os.path.join(eda_dir, 'eda_summary.json'), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+        desc_str = pd.DataFrame({col: {k: v for k, v in stats.items() if k != 'histogram'}
+                                 for col, stats in summary['columns'].items()}).to_string()
+        logging.info(f"Headless EDA completed. {len(plots)} plots and eda_summary.json saved in '{eda_dir}' directory.")
+        return info_str, desc_str
+
+    def perform_eda_incremental(self, file_path, eda_dir=EDA_DIR, cache_dir=None, bins=30, max_workers=None):
+        """
+        Incremental EDA over a CSV. The input is fingerprinted and per-column statistics, histograms and
+        correlation sums are cached in `cache_dir`:
+        - unchanged file: the cached summary is returned without reading the data;
+        - file only grew (append-only logs): just the new rows are parsed and folded into the running statistics;
+        - otherwise: the file is reloaded and only columns whose contents changed are recomputed and re-plotted.
+        Returns the summary that is also written to eda_summary.json.
+        """
+        cache_dir = cache_dir or os.path.join(eda_dir, '.eda_cache')
+        os.makedirs(cache_dir, exist_ok=True)
+        state_path = os.path.join(cache_dir, 'eda_state.json')
+
+        state = None
+        if os.path.exists(state_path):
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+
+        file_size = os.path.getsize(file_path)
+        checkpoint = state['file_size'] if state and state['file_size'] <= file_size else None
+        file_hash, prefix_hash = _file_sha256(file_path, checkpoint)
+
+        if state and state['file_hash'] == file_hash:
+            logging.info("Input unchanged since the last EDA run. Reusing cached statistics and plots.")
+            return state['summary']
+
+        options = self.read_csv_options(file_path)
+        if state and prefix_hash == state['file_hash'] and state['ends_with_newline']:
+            changed = self._append_eda_state(state, file_path, options, bins)
+        else:
+            state, changed = self._rebuild_eda_state(state, file_path, options, bins)
+
+        with open(file_path, 'rb') as f:
+            f.seek(max(file_size - 1, 0))
+            state['ends_with_newline'] = f.read(1) in (b'\n', b'')
+        state['file_size'] = file_size
+        state['file_hash'] = file_hash
+
+        # Re-render only the histograms of changed columns, plus the heatmap when anything changed
+        columns = state['columns']
+        jobs = [(_render_histogram, col, np.array(state['stats'][col]['counts']), np.array(state['stats'][col]['edges']),
+                 os.path.join(eda_dir, f'histogram_{_column_slug(col)}.png'))
+                for col in changed if state['stats'][col]['count'] > 0]
+        corr = correlation_from_sums({key: np.array(value) for key, value in state['corr_sums'].items()})
+        if changed:
+            jobs.append((_render_heatmap, columns, corr, os.path.join(eda_dir, 'correlation_heatmap.png')))
+        os.makedirs(eda_dir, exist_ok=True)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(job[0], *job[1:]) for job in jobs]
+            for future in futures:
+                future.result()
+
+        summary = {'rows': state['rows'], 'columns': {}, 'correlation': {}}
+        for col in columns:
+            stats = state['stats'][col]
+            summary['columns'][col] = {
+                'count': stats['count'],
+                'mean': stats['mean'] if stats['count'] else None,
+                'std': float(np.sqrt(stats['m2'] / (stats['count'] - 1))) if stats['count'] > 1 else None,
+                'min': stats['min'],
+                'max': stats['max'],
+                'histogram': {'counts': stats['counts'], 'edges': stats['edges']},
+            }
+        summary['correlation'] = {col: {other: (None if np.isnan(corr[i, j]) else float(corr[i, j]))
+                                        for j, other in enumerate(columns)} for i, col in enumerate(columns)}
+        state['summary'] = summary
+
+        with open(os.path.join(eda_dir, 'eda_summary.json'), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        with open(state_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+
+        logging.info(f"Incremental EDA completed. Recomputed {len(changed)} of {len(columns)} columns.")
+        return summary
+
+    def _rebuild_eda_state(self, state, file_path, options, bins):
+        df = pd.read_csv(file_path, **options)
+        numeric = df.select_dtypes(include=[np.number])
+        columns = list(numeric.columns)
+        values = numeric.to_numpy(dtype=np.float64)
+
+        old_stats = state['stats'] if state and state['columns'] == columns else {}
+        new_state = {'columns': columns, 'rows': len(df), 'stats': {}}
+        changed = []
+        for idx, col in enumerate(columns):
+            column_hash = _column_hash(numeric[col])
+            if col in old_stats and old_stats[col]['hash'] == column_hash:
+                new_state['stats'][col] = old_stats[col]
+                continue
+            new_state['stats'][col] = dict(_column_state(values[:, idx], bins), hash=column_hash)
+            changed.append(col)
+
+        shift = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else np.zeros(len(columns))
+        new_state['corr_shift'] = shift.tolist()
+        new_state['corr_sums'] = {key: value.tolist() for key, value in correlation_sums(values, shift).items()}
+        return new_state, changed
+
+    def _append_eda_state(self, state, file_path, options, bins):
+        # Parse only the bytes appended since the last run, reusing the header from the first line
+        header = pd.read_csv(file_path, nrows=0).columns
+        with open(file_path, 'rb') as f:
+            f.seek(state['file_size'])
+            new_rows = pd.read_csv(f, header=None, names=header, **options)
+
+        columns = state['columns']
+        values = new_rows[columns].to_numpy(dtype=np.float64)
+        start = state['rows']
+        state['rows'] += len(new_rows)
+
+        changed = []
+        for idx, col in enumerate(columns):
+            stats = state['stats'][col]
+            stats['hash'] = (stats['hash'] + _column_hash(new_rows[col], start)) % (1 << 64)
+            column_values = values[:, idx]
+            column_values = column_values[~np.isnan(column_values)]
+            if len(column_values) == 0:
+                continue
+            changed.append(col)
+
+            if stats['count'] and stats['min'] <= column_values.min() and column_values.max() <= stats['max']:
+                # New values fall inside the existing bins: update moments and histogram counts in place
+                merged = {'count': np.array([stats['count']]), 'mean': np.array([stats['mean']]), 'm2': np.array([stats['m2']])}
+                self._merge_moments(merged, np.array([len(column_values)]), np.array([column_values.mean()]),
+                                    np.array([((column_values - column_values.mean()) ** 2).sum()]))
+                stats['count'], stats['mean'], stats['m2'] = int(merged['count'][0]), float(merged['mean'][0]), float(merged['m2'][0])
+                stats['counts'] = (np.array(stats['counts']) + np.histogram(column_values, bins=np.array(stats['edges']))[0]).tolist()
+            else:
+                # The range grew, so the bins move: recompute this column alone from the full file
+                column_options = {**options, 'parse_dates': [c for c in options['parse_dates'] if c == col]}
+                full_column = pd.read_csv(file_path, usecols=[col], **column_options)[col].to_numpy(dtype=np.float64)
+                state['stats'][col] = dict(_column_state(full_column, bins), hash=stats['hash'])
+
+        sums = correlation_sums(values, np.array(state['corr_shift']))
+        state['corr_sums'] = {key: (np.array(state['corr_sums'][key]) + value).tolist() for key, value in sums.items()}
+        return changed
+
+    def preprocess_data(self, df, text_column=None, vectorized=True):
         """
         Preprocess the data by applying various cleaning and transformation steps.
+        Text cleaning uses pandas .str operations unless vectorized=False.
         """
         logging.info("Starting data preprocessing")
 
@@ -134,12 +673,42 @@ class DataPreprocessor:
 
         # Clean text data if a text column is specified
         if text_column and text_column in df.columns:
-            df[text_column] = df[text_column].apply(self.clean_text)
-            df[text_column] = df[text_column].apply(self.remove_stopwords)
+            if vectorized:
+                df[text_column] = self.remove_stopwords_series(self.clean_text_series(df[text_column]))
+            else:
+                df[text_column] = df[text_column].apply(self.clean_text)
+                df[text_column] = df[text_column].apply(self.remove_stopwords)
 
         logging.info("Data preprocessing completed")
         return df
 
+def benchmark_text_cleaning(n_rows=1_000_000, seed=0):
+    """
+    Compare the row-wise and vectorized text cleaning paths on a synthetic text column and check they agree.
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(["The", "snow", "depth", "was", "12.5", "inches,", "and", "it", "cannot", "melt!",
+                           "Temperature", "is", "below", "freezing", "at", "3am", "gonna", "be", "cold", "today."])
+    lengths = rng.integers(3, 30, size=n_rows)
+    words = rng.choice(vocabulary, size=int(lengths.sum()))
+    texts = [' '.join(chunk) for chunk in np.split(words, np.cumsum(lengths)[:-1])]
+
+    preprocessor = DataPreprocessor()
+    series = pd.Series(texts, name='text')
+
+    start = time.perf_counter()
+    rowwise = series.apply(preprocessor.clean_text).apply(preprocessor.remove_stopwords)
+    rowwise_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = preprocessor.remove_stopwords_series(preprocessor.clean_text_series(series))
+    vectorized_seconds = time.perf_counter() - start
+
+    identical = rowwise.equals(vectorized)
+    logging.info(f"Text cleaning on {n_rows} rows: row-wise {rowwise_seconds:.2f}s, vectorized {vectorized_seconds:.2f}s, "
+                 f"speedup {rowwise_seconds / vectorized_seconds:.1f}x, identical output: {identical}")
+    return rowwise_seconds, vectorized_seconds, identical
+
 class DataVisualizationGUI:
     def __init__(self, master, df, info_str, desc_str):
         self.master = master
@@ -153,6 +722,9 @@ class DataVisualizationGUI:
         self.create_widgets()
 
     def create_widgets(self):
+        import tkinter as tk
+        from tkinter import ttk
+
         # Create tabs
         self.notebook = ttk.Notebook(self.master)
         self.notebook.pack(fill=tk.BOTH, expand=True)
@@ -182,46 +754,99 @@ class DataVisualizationGUI:
         self.notebook.add(heatmap_frame, text="Correlation Heatmap")
         self.heatmap_canvas = tk.Canvas(heatmap_frame)
         self.heatmap_canvas.pack(fill=tk.BOTH, expand=True)
-        
+
+        # Plot tabs: frame -> (plot file, canvas). Images are loaded and resized only when their tab is shown.
+        self.plot_tabs = {
+            str(hist_frame): ('histograms.png', self.hist_canvas),
+            str(heatmap_frame): ('correlation_heatmap.png', self.heatmap_canvas),
+        }
+        self.images = {}
+        self.previews = {}
+        self.photos = {}
+        self.resize_cache = OrderedDict()
+        self.resize_job = None
+        self.last_size = None
+
         # Load and display plots
         self.load_plots()
 
-        # Bind resize event
+        # Bind resize and tab change events
         self.master.bind("<Configure>", self.on_resize)
+        self.notebook.bind("<<NotebookTabChanged>>", lambda event: self.render_visible_tab(high_quality=True))
 
     def load_plots(self):
-        eda_dir = os.path.join('NLP Enhancements', 'data_handling', 'eda_plots')
-        
-        # Load histogram
-        self.hist_img = Image.open(os.path.join(eda_dir, 'histograms.png'))
-        self.hist_photo = ImageTk.PhotoImage(self.hist_img)
-        self.hist_canvas.create_image(0, 0, anchor=tk.NW, image=self.hist_photo)
-        
-        # Load heatmap
-        self.heatmap_img = Image.open(os.path.join(eda_dir, 'correlation_heatmap.png'))
-        self.heatmap_photo = ImageTk.PhotoImage(self.heatmap_img)
-        self.heatmap_canvas.create_image(0, 0, anchor=tk.NW, image=self.heatmap_photo)
+        from PIL import Image
+
+        # Image.open only reads the header; pixel data is decoded on first resize of a visible tab
+        for filename, _ in self.plot_tabs.values():
+            self.images[filename] = Image.open(os.path.join(EDA_DIR, filename))
+            self.previews.pop(filename, None)
+        self.resize_cache.clear()
+        self.render_visible_tab(high_quality=True)
+
+    def get_resized(self, filename, size, high_quality):
+        """
+        Resize a plot to the canvas size, rounded to a size bucket and served from a small LRU cache.
+        Previews are resampled from a downsampled copy with BILINEAR; the final pass uses LANCZOS.
+        """
+        from PIL import Image
+
+        width = max(RESIZE_BUCKET, size[0] // RESIZE_BUCKET * RESIZE_BUCKET)
+        height = max(RESIZE_BUCKET, size[1] // RESIZE_BUCKET * RESIZE_BUCKET)
+        key = (filename, width, height, high_quality)
+        if key in self.resize_cache:
+            self.resize_cache.move_to_end(key)
+            return self.resize_cache[key]
+
+        if high_quality:
+            resized = self.images[filename].resize((width, height), Image.Resampling.LANCZOS)
+        else:
+            if filename not in self.previews:
+                preview = self.images[filename].copy()
+                preview.thumbnail((PREVIEW_MAX_SIZE, PREVIEW_MAX_SIZE))
+                self.previews[filename] = preview
+            resized = self.previews[filename].resize((width, height), Image.Resampling.BILINEAR)
+
+        self.resize_cache[key] = resized
+        if len(self.resize_cache) > RESIZE_CACHE_SIZE:
+            self.resize_cache.popitem(last=False)
+        return resized
+
+    def render_visible_tab(self, high_quality):
+        import tkinter as tk
+        from PIL import ImageTk
+
+        tab = self.plot_tabs.get(self.notebook.select())
+        if tab is None:
+            return
+        filename, canvas = tab
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return  # not laid out yet
+
+        self.photos[filename] = ImageTk.PhotoImage(self.get_resized(filename, (width, height), high_quality))
+        canvas.delete("all")
+        canvas.create_image(0, 0, anchor=tk.NW, image=self.photos[filename])
 
     def on_resize(self, event):
-        # Resize histogram
-        width = self.hist_canvas.winfo_width()
-        height = self.hist_canvas.winfo_height()
-        resized_hist = self.hist_img.resize((width, height), Image.Resampling.LANCZOS)
-        self.hist_photo = ImageTk.PhotoImage(resized_hist)
-        self.hist_canvas.delete("all")
-        self.hist_canvas.create_image(0, 0, anchor=tk.NW, image=self.hist_photo)
-
-        # Resize heatmap
-        width = self.heatmap_canvas.winfo_width()
-        height = self.heatmap_canvas.winfo_height()
-        resized_heatmap = self.heatmap_img.resize((width, height), Image.Resampling.LANCZOS)
-        self.heatmap_photo = ImageTk.PhotoImage(resized_heatmap)
-        self.heatmap_canvas.delete("all")
-        self.heatmap_canvas.create_image(0, 0, anchor=tk.NW, image=self.heatmap_photo)
+        # <Configure> bound on the toplevel also fires for every child widget; only the window itself matters
+        if event.widget is not self.master or (event.width, event.height) == self.last_size:
+            return
+        self.last_size = (event.width, event.height)
+
+        # Cheap preview while dragging, then one high-quality pass once resizing has stopped
+        self.render_visible_tab(high_quality=False)
+        if self.resize_job is not None:
+            self.master.after_cancel(self.resize_job)
+        self.resize_job = self.master.after(RESIZE_DEBOUNCE_MS, self.finish_resize)
+
+    def finish_resize(self):
+        self.resize_job = None
+        self.render_visible_tab(high_quality=True)
 
 # Example usage
 if __name__ == "__main__":
-    preprocessor = DataPreprocessor()
+    preprocessor = DataPreprocessor(schema=AVALANCHE_SCHEMA)
     
     # Load data
     data = preprocessor.load_data('NLP Enhancements/data_handling/Avalache_data.csv')
@@ -234,6 +859,7 @@ if __name__ == "__main__":
         info_str, desc_str = preprocessor.perform_eda(preprocessed_data)
         
         # Create and run GUI
+        import tkinter as tk
         root = tk.Tk()
         app = DataVisualizationGUI(root, preprocessed_data, info_str, desc_str)
         root.mainloop()
@@ -1,19 +1,83 @@
-import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize, TreebankWordTokenizer, RegexpTokenizer
-from nltk.corpus import stopwords
+from functools import lru_cache
+import os
 import re
+import sys
+import time
 import logging
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from tokenization_metrics import metrics, instrumented
+from nlp_resources import ensure_nltk_resource, ensure_punkt
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-# Download necessary NLTK data
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-except Exception as e:
-    logging.error(f"Error downloading NLTK data: {str(e)}")
+# NLTK is imported on first use and its data is checked locally (downloaded only when missing and not offline)
+# Tokenizer registry: stopword sets and tokenizer instances are built once and reused across calls
+@lru_cache(maxsize=None)
+def get_stopwords(language='english'):
+    """
+    Load the NLTK stopword list for a language once and cache it as a frozenset.
+    
+    :param language: Stopword language
+    :return: Frozenset of stopwords
+    """
+    ensure_nltk_resource('corpora/stopwords')
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words(language))
+
+@lru_cache(maxsize=1)
+def get_treebank_tokenizer():
+    """
+    Return the shared TreebankWordTokenizer instance.
+    
+    :return: TreebankWordTokenizer
+    """
+    from nltk.tokenize import TreebankWordTokenizer
+    return TreebankWordTokenizer()
+
+@lru_cache(maxsize=None)
+def get_punkt_tokenizer(language='english'):
+    """
+    Load the pretrained Punkt sentence tokenizer for a language once and reuse it.
+    
+    :param language: Punkt model language
+    :return: Punkt sentence tokenizer
+    """
+    ensure_punkt()
+    try:
+        # NLTK >= 3.8.2 ships the parameters as punkt_tab
+        from nltk.tokenize.punkt import PunktTokenizer
+        return PunktTokenizer(language)
+    except ImportError:
+        import nltk.data
+        return nltk.data.load(f'tokenizers/punkt/{language}.pickle')
+
+@lru_cache(maxsize=1)
+def get_word_tokenize():
+    """
+    Return NLTK's word_tokenize once the Punkt model it relies on is available.
+    
+    :return: word_tokenize function
+    """
+    ensure_punkt()
+    from nltk.tokenize import word_tokenize
+    return word_tokenize
+
+@lru_cache(maxsize=128)
+def get_regexp_tokenizer(pattern=r'\w+', gaps=False, discard_empty=True):
+    """
+    Return a RegexpTokenizer for the given options, compiled once per distinct key (LRU-bounded).
+    
+    :param pattern: Regular expression pattern for tokenization
+    :param gaps: If True, the pattern matches separators instead of tokens
+    :param discard_empty: If True, drop empty tokens
+    :return: RegexpTokenizer
+    """
+    from nltk.tokenize import RegexpTokenizer
+    return RegexpTokenizer(pattern, gaps=gaps, discard_empty=discard_empty)
 
+@instrumented("nltk_word_tokenize")
 def nltk_word_tokenize(text, remove_punctuation=False, remove_stopwords=False):
     """
     Tokenize text into words using NLTK with additional options.
@@ -28,21 +92,23 @@ def nltk_word_tokenize(text, remove_punctuation=False, remove_stopwords=False):
         text = str(text)
     
     try:
-        tokens = word_tokenize(text)
+        tokens = get_word_tokenize()(text)
         
         if remove_punctuation:
             tokens = [token for token in tokens if token.isalnum()]
         
         if remove_stopwords:
-            stop_words = set(stopwords.words('english'))
+            stop_words = get_stopwords('english')
             tokens = [token for token in tokens if token.lower() not in stop_words]
         
-        logging.info(f"Word tokenization completed. Number of tokens: {len(tokens)}")
+        logging.debug("Word tokenization completed. Number of tokens: %d", len(tokens))
         return tokens
     except Exception as e:
+        metrics.record_error("nltk_word_tokenize")
         logging.error(f"Error during word tokenization: {str(e)}")
         return []
 
+@instrumented("nltk_sentence_tokenize")
 def nltk_sentence_tokenize(text, min_length=0):
     """
     Tokenize text into sentences using NLTK with minimum length option.
@@ -56,13 +122,14 @@ def nltk_sentence_tokenize(text, min_length=0):
         text = str(text)
     
     try:
-        sentences = sent_tokenize(text)
+        sentences = get_punkt_tokenizer('english').tokenize(text)
         if min_length > 0:
             sentences = [sent for sent in sentences if len(sent.split()) >= min_length]
         
-        logging.info(f"Sentence tokenization completed. Number of sentences: {len(sentences)}")
+        logging.debug("Sentence tokenization completed. Number of sentences: %d", len(sentences))
         return sentences
     except Exception as e:
+        metrics.record_error("nltk_sentence_tokenize")
         logging.error(f"Error during sentence tokenization: {str(e)}")
         return []
 
@@ -73,8 +140,7 @@ def treebank_word_tokenize(text):
     :param text: Input text to tokenize
     :return: List of word tokens
     """
-    tokenizer = TreebankWordTokenizer()
-    return tokenizer.tokenize(text)
+    return get_treebank_tokenizer().tokenize(text)
 
 def regex_word_tokenize(text, pattern=r'\w+'):
     """
@@ -84,8 +150,77 @@ def regex_word_tokenize(text, pattern=r'\w+'):
     :param pattern: Regular expression pattern for tokenization
     :return: List of word tokens
     """
-    tokenizer = RegexpTokenizer(pattern)
-    return tokenizer.tokenize(text)
+    return get_regexp_tokenizer(pattern).tokenize(text)
+
+# Batch variants: resolve tokenizers and stopwords once, then stream over the inputs
+def nltk_word_tokenize_batch(texts, remove_punctuation=False, remove_stopwords=False):
+    """
+    Tokenize a list or generator of texts into words using NLTK.
+    
+    :param texts: Iterable of input texts
+    :param remove_punctuation: If True, remove punctuation from tokens
+    :param remove_stopwords: If True, remove stopwords from tokens
+    :return: Generator yielding one list of word tokens per text
+    """
+    try:
+        word_tokenize = get_word_tokenize()
+    except Exception as e:
+        # Raise inside the loop below so every text is still answered (and counted) with an empty list
+        def word_tokenize(text, error=e):
+            raise error.with_traceback(None)
+    stop_words = get_stopwords('english') if remove_stopwords else None
+    for text in texts:
+        start = time.perf_counter()
+        if not isinstance(text, str):
+            text = str(text)
+        try:
+            tokens = word_tokenize(text)
+        except Exception as e:
+            metrics.record_error("nltk_word_tokenize")
+            logging.error(f"Error during word tokenization: {str(e)}")
+            yield []
+            continue
+
+        if remove_punctuation:
+            tokens = [token for token in tokens if token.isalnum()]
+        if stop_words is not None:
+            tokens = [token for token in tokens if token.lower() not in stop_words]
+        metrics.record("nltk_word_tokenize", len(tokens), time.perf_counter() - start)
+        yield tokens
+
+def nltk_sentence_tokenize_batch(texts, min_length=0):
+    """
+    Tokenize a list or generator of texts into sentences using NLTK.
+    
+    :param texts: Iterable of input texts
+    :param min_length: Minimum length of sentences to keep
+    :return: Generator yielding one list of sentences per text
+    """
+    for text in texts:
+        yield nltk_sentence_tokenize(text, min_length)
+
+def treebank_word_tokenize_batch(texts):
+    """
+    Tokenize a list or generator of texts using the shared Treebank word tokenizer.
+    
+    :param texts: Iterable of input texts
+    :return: Generator yielding one list of word tokens per text
+    """
+    tokenize = get_treebank_tokenizer().tokenize
+    for text in texts:
+        yield tokenize(text)
+
+def regex_word_tokenize_batch(texts, pattern=r'\w+'):
+    """
+    Tokenize a list or generator of texts using one compiled regular expression pattern.
+    
+    :param texts: Iterable of input texts
+    :param pattern: Regular expression pattern for tokenization
+    :return: Generator yielding one list of word tokens per text
+    """
+    tokenize = get_regexp_tokenizer(pattern).tokenize
+    for text in texts:
+        yield tokenize(text)
 
 # Example usage
 if __name__ == "__main__":
@@ -95,3 +230,5 @@ if __name__ == "__main__":
     print("Sentence tokens:", nltk_sentence_tokenize(sample_text, min_length=3))
     print("Treebank tokens:", treebank_word_tokenize(sample_text))
     print("Regex tokens:", regex_word_tokenize(sample_text))
+    print("Regex tokens (batch):", list(regex_word_tokenize_batch([sample_text, sample_text.upper()])))
+    print("Metrics:", metrics.snapshot())
@@ -0,0 +1,230 @@
+from collections import namedtuple
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from additional_methods import regex_word_tokenize_batch, metrics
+
+# Feature hashing for word and character n-grams (the N-gram and Character tokenization of the Readme).
+# N-grams are never built as strings or tuples: every distinct token is hashed once, n-gram hashes are combined
+# from the token (or code point) hashes with vectorized uint64 arithmetic, and each batch becomes a CSR matrix
+# over a fixed number of columns. Memory depends on the batch size only, not on the corpus or its vocabulary.
+
+N_FEATURES = 2 ** 20
+TOKEN_HASH_CACHE_SIZE = 1_000_000
+
+# 64-bit mixing constants (splitmix64 finalizer) and per-analyzer seeds so word and char n-grams hash apart
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_WORD_SEED = 0x5745
+_CHAR_SEED = 0x4348
+
+HashedFeatures = namedtuple("HashedFeatures", ["data", "indices", "indptr", "n_features"])
+HashedFeatures.__doc__ = """
+CSR feature matrix for one batch: row i has columns indices[indptr[i]:indptr[i + 1]] with values data[...].
+Convert with to_scipy() when scipy is available.
+"""
+
+def to_scipy(features):
+    """
+    Convert HashedFeatures to a scipy.sparse.csr_matrix (scipy is imported on first use).
+
+    :param features: HashedFeatures
+    :return: csr_matrix of shape (documents, n_features)
+    """
+    from scipy.sparse import csr_matrix
+    return csr_matrix((features.data, features.indices, features.indptr), shape=(len(features.indptr) - 1, features.n_features))
+
+def _mix(values):
+    values = values ^ (values >> np.uint64(30))
+    values = values * _MIX_1
+    values = values ^ (values >> np.uint64(27))
+    values = values * _MIX_2
+    return values ^ (values >> np.uint64(31))
+
+_token_hashes = {}
+
+def _hash_tokens(tokens):
+    # 64-bit blake2b hash per distinct token, cached across batches until the cache is full
+    hashes = np.empty(len(tokens), dtype=np.uint64)
+    for i, token in enumerate(tokens):
+        value = _token_hashes.get(token)
+        if value is None:
+            value = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+            if len(_token_hashes) < TOKEN_HASH_CACHE_SIZE:
+                _token_hashes[token] = value
+        hashes[i] = value
+    return hashes
+
+def _ngram_features(unit_hashes, offsets, ngram_range, n_features, alternate_sign, seed):
+    """
+    Hash every n-gram of the units (tokens or code points) of each document and count them per column.
+
+    :param unit_hashes: uint64 hash of every unit of the batch, documents back to back
+    :param offsets: int64 array of len(documents) + 1; document i has units offsets[i]:offsets[i + 1]
+    :return: HashedFeatures
+    """
+    num_docs = len(offsets) - 1
+    lengths = np.diff(offsets)
+    doc_of_unit = np.repeat(np.arange(num_docs, dtype=np.int64), lengths)
+    doc_end = offsets[1:][doc_of_unit]
+    positions = np.arange(len(unit_hashes), dtype=np.int64)
+
+    rows, columns, values = [], [], []
+    for n in range(ngram_range[0], ngram_range[1] + 1):
+        # Start positions whose n-gram stays inside its document
+        starts = positions[positions + n <= doc_end]
+        if not len(starts):
+            continue
+        combined = np.full(len(starts), np.uint64(seed * 1000 + n))
+        for k in range(n):
+            combined = (combined * _MULTIPLIER) ^ unit_hashes[starts + k]
+        combined = _mix(combined)
+
+        rows.append(doc_of_unit[starts])
+        columns.append((combined % np.uint64(n_features)).astype(np.int64))
+        if alternate_sign:
+            values.append(np.where(combined >> np.uint64(63), -1.0, 1.0).astype(np.float32))
+        else:
+            values.append(np.ones(len(starts), dtype=np.float32))
+
+    if not rows:
+        return HashedFeatures(np.empty(0, np.float32), np.empty(0, np.int32), np.zeros(num_docs + 1, np.int64), n_features)
+
+    # Sum duplicate (row, column) pairs; sorted keys give CSR order directly
+    keys, inverse = np.unique(np.concatenate(rows) * n_features + np.concatenate(columns), return_inverse=True)
+    data = np.bincount(inverse, weights=np.concatenate(values)).astype(np.float32)
+    nonzero = data != 0
+    keys, data = keys[nonzero], data[nonzero]
+    indptr = np.searchsorted(keys // n_features, np.arange(num_docs + 1), side="left").astype(np.int64)
+    return HashedFeatures(data, (keys % n_features).astype(np.int32), indptr, n_features)
+
+def hash_word_ngrams(token_lists, ngram_range=(1, 2), n_features=N_FEATURES, alternate_sign=False, lowercase=True):
+    """
+    Hash word n-grams of already tokenized documents (e.g. from regex_word_tokenize_batch).
+
+    :param token_lists: List of token lists, one per document
+    :param ngram_range: Smallest and largest n (inclusive)
+    :param n_features: Number of hash buckets (columns)
+    :param alternate_sign: If True, use the hash sign bit so collisions tend to cancel out
+    :param lowercase: If True, lowercase tokens before hashing
+    :return: HashedFeatures with one row per document
+    """
+    lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    flat = [token.lower() if lowercase else token for tokens in token_lists for token in tokens]
+    return _ngram_features(_hash_tokens(flat), offsets, ngram_range, n_features, alternate_sign, _WORD_SEED)
+
+def hash_char_ngrams(texts, ngram_range=(2, 4), n_features=N_FEATURES, alternate_sign=False, lowercase=True):
+    """
+    Hash character n-grams of raw texts. The batch is decoded to code points in one pass, so no per-character
+    or per-n-gram strings are created.
+
+    :param texts: List of input texts
+    :param ngram_range: Smallest and largest n (inclusive)
+    :param n_features: Number of hash buckets (columns)
+    :param alternate_sign: If True, use the hash sign bit so collisions tend to cancel out
+    :param lowercase: If True, lowercase texts before hashing
+    :return: HashedFeatures with one row per text
+    """
+    texts = [text.lower() if lowercase else text for text in texts]
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    code_points = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    return _ngram_features(_mix(code_points), offsets, ngram_range, n_features, alternate_sign, _CHAR_SEED)
+
+def _hstack(first, second):
+    # Both parts share the same hash space; merge rows and re-sum columns that appear in both
+    if second is None:
+        return first
+    num_docs = len(first.indptr) - 1
+    rows = np.concatenate([np.repeat(np.arange(num_docs), np.diff(part.indptr)) for part in (first, second)])
+    keys = rows * first.n_features + np.concatenate((first.indices, second.indices))
+    keys, inverse = np.unique(keys, return_inverse=True)
+    data = np.bincount(inverse, weights=np.concatenate((first.data, second.data))).astype(np.float32)
+    nonzero = data != 0
+    keys, data = keys[nonzero], data[nonzero]
+    indptr = np.searchsorted(keys // first.n_features, np.arange(num_docs + 1), side="left").astype(np.int64)
+    return HashedFeatures(data, (keys % first.n_features).astype(np.int32), indptr, first.n_features)
+
+class NgramHasher:
+    """
+    Streaming featurizer combining hashed word n-grams and (optionally) character n-grams.
+
+    :param n_features: Number of hash buckets (columns)
+    :param word_ngram_range: Range of word n-grams, or None to skip word features
+    :param char_ngram_range: Range of character n-grams, or None to skip character features
+    :param tokenize_batch: Batch tokenizer yielding one token list per text (default: regex_word_tokenize_batch)
+    :param alternate_sign: If True, use the hash sign bit so collisions tend to cancel out
+    :param lowercase: If True, lowercase tokens and texts before hashing
+    :param batch_size: Documents per CSR batch in iter_transform
+    """
+    def __init__(self, n_features=N_FEATURES, word_ngram_range=(1, 2), char_ngram_range=None, tokenize_batch=None,
+                 alternate_sign=False, lowercase=True, batch_size=10000):
+        if word_ngram_range is None and char_ngram_range is None:
+            raise ValueError("At least one of word_ngram_range or char_ngram_range is required.")
+        self.n_features = n_features
+        self.word_ngram_range = word_ngram_range
+        self.char_ngram_range = char_ngram_range
+        self.tokenize_batch = tokenize_batch or regex_word_tokenize_batch
+        self.alternate_sign = alternate_sign
+        self.lowercase = lowercase
+        self.batch_size = batch_size
+
+    def transform(self, texts, token_lists=None):
+        """
+        Featurize one batch of texts. Pass `token_lists` to reuse tokens produced elsewhere.
+
+        :param texts: List of input texts
+        :param token_lists: Optional list of token lists matching `texts`
+        :return: HashedFeatures with one row per text
+        """
+        start = time.perf_counter()
+        texts = list(texts)
+        features = None
+        if self.word_ngram_range is not None:
+            token_lists = list(token_lists) if token_lists is not None else list(self.tokenize_batch(texts))
+            features = hash_word_ngrams(token_lists, self.word_ngram_range, self.n_features, self.alternate_sign, self.lowercase)
+        if self.char_ngram_range is not None:
+            char_features = hash_char_ngrams(texts, self.char_ngram_range, self.n_features, self.alternate_sign, self.lowercase)
+            features = char_features if features is None else _hstack(features, char_features)
+        metrics.record("ngram_hasher", len(features.indices), time.perf_counter() - start, len(texts))
+        return features
+
+    def iter_transform(self, texts):
+        """
+        Featurize a list or generator of texts in batches of `batch_size`, yielding one HashedFeatures per batch.
+
+        :param texts: Iterable of input texts
+        :return: Generator of HashedFeatures
+        """
+        batch = []
+        for text in texts:
+            batch.append(text if isinstance(text, str) else str(text))
+            if len(batch) == self.batch_size:
+                yield self.transform(batch)
+                batch = []
+        if batch:
+            yield self.transform(batch)
+
+# Example usage
+if __name__ == "__main__":
+    sample_texts = [
+        "Hello, world! This is a sample sentence.",
+        "NLTK is great for NLP tasks.",
+        "",
+    ]
+    hasher = NgramHasher(n_features=2 ** 18, word_ngram_range=(1, 2), char_ngram_range=(3, 4))
+    features = hasher.transform(sample_texts)
+    print("Non-zeros per document:", np.diff(features.indptr).tolist())
+    print("Columns of document 1:", features.indices[features.indptr[1]:features.indptr[2]][:10].tolist())
+
+    start = time.perf_counter()
+    documents = (sample_texts[i % 2] for i in range(200_000))
+    total = sum(len(batch.indices) for batch in hasher.iter_transform(documents))
+    print(f"Hashed 200000 documents ({total} non-zeros) in {time.perf_counter() - start:.2f}s")
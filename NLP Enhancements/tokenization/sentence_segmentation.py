@@ -0,0 +1,225 @@
+from bisect import bisect_left
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from additional_methods import get_punkt_tokenizer, metrics
+
+# Parallel Punkt sentence segmentation.
+# Punkt parameters can be trained on our own corpus once, saved as JSON and reloaded. Large documents are cut at
+# paragraph breaks (blank lines, which always end a sentence here) into chunks that worker processes segment
+# independently, and sentences come back as (start, end) character offsets into the original text.
+# Results do not depend on the number of workers: every paragraph is segmented on its own either way.
+
+PARAGRAPH_BREAK = re.compile(r"\n(?:[ \t\r\f\v]*\n)+")
+CHUNK_CHARS = 1 << 20
+
+def train_punkt(texts, path=None, include_all_collocs=False):
+    """
+    Train Punkt parameters (abbreviations, collocations, sentence starters) on a stream of texts.
+
+    :param texts: Iterable of training texts
+    :param path: If given, save the parameters there as JSON
+    :param include_all_collocs: If True, learn collocations between any word pairs, not only after numbers/initials
+    :return: PunktParameters
+    """
+    from nltk.tokenize.punkt import PunktTrainer
+
+    trainer = PunktTrainer()
+    trainer.INCLUDE_ALL_COLLOCS = include_all_collocs
+    start = time.perf_counter()
+    for text in texts:
+        trainer.train(text, finalize=False)
+    trainer.finalize_training()
+    params = trainer.get_params()
+    metrics.record("train_punkt", seconds=time.perf_counter() - start)
+
+    if path:
+        save_punkt_params(params, path)
+    return params
+
+def punkt_params_to_json(params):
+    return json.dumps({
+        "abbrev_types": sorted(params.abbrev_types),
+        "collocations": sorted(params.collocations),
+        "sent_starters": sorted(params.sent_starters),
+        "ortho_context": dict(sorted(params.ortho_context.items())),
+    })
+
+def punkt_params_from_json(params_json):
+    from nltk.tokenize.punkt import PunktParameters
+
+    data = json.loads(params_json)
+    params = PunktParameters()
+    params.abbrev_types = set(data["abbrev_types"])
+    params.collocations = {tuple(pair) for pair in data["collocations"]}
+    params.sent_starters = set(data["sent_starters"])
+    params.ortho_context = defaultdict(int, data["ortho_context"])
+    return params
+
+def save_punkt_params(params, path):
+    """
+    Save PunktParameters as JSON (written atomically).
+
+    :param params: PunktParameters
+    :param path: Output file path
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(punkt_params_to_json(params))
+    os.replace(tmp_path, path)
+
+def load_punkt_params(path):
+    """
+    Load PunktParameters saved by save_punkt_params.
+
+    :param path: JSON file path
+    :return: PunktParameters
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return punkt_params_from_json(f.read())
+
+def _build_tokenizer(params_json):
+    if params_json is None:
+        return get_punkt_tokenizer('english')
+    from nltk.tokenize.punkt import PunktSentenceTokenizer
+    return PunktSentenceTokenizer(punkt_params_from_json(params_json))
+
+def _span_paragraphs(tokenizer, text, base=0):
+    # Sentence spans of every paragraph of `text`, shifted by `base`, as an (n, 2) int64 array
+    spans = []
+    start = 0
+    for match in PARAGRAPH_BREAK.finditer(text):
+        paragraph = text[start:match.start()]
+        spans.extend((base + start + s, base + start + e) for s, e in tokenizer.span_tokenize(paragraph))
+        start = match.end()
+    spans.extend((base + start + s, base + start + e) for s, e in tokenizer.span_tokenize(text[start:]))
+    return np.array(spans, dtype=np.int64).reshape(-1, 2)
+
+# Worker state: the tokenizer is built once per worker process by the pool initializer
+_worker_tokenizer = None
+
+def _init_worker(params_json):
+    global _worker_tokenizer
+    _worker_tokenizer = _build_tokenizer(params_json)
+
+def _segment_chunk(chunk, base):
+    return _span_paragraphs(_worker_tokenizer, chunk, base)
+
+def paragraph_chunks(text, chunk_chars=CHUNK_CHARS):
+    """
+    Cut `text` at paragraph breaks into (start, end) ranges of roughly `chunk_chars` characters.
+    A text without paragraph breaks stays one chunk.
+
+    :param text: Input text
+    :param chunk_chars: Target chunk length in characters
+    :return: List of (start, end) ranges covering the text
+    """
+    breaks = [match.end() for match in PARAGRAPH_BREAK.finditer(text)]
+    chunks = []
+    start = 0
+    while start < len(text):
+        index = bisect_left(breaks, start + chunk_chars)
+        end = breaks[index] if index < len(breaks) else len(text)
+        chunks.append((start, end))
+        start = end
+    return chunks
+
+class SentenceSegmenter:
+    """
+    Long-lived sentence segmentation service backed by a pool of worker processes.
+
+    :param params_path: Punkt parameters saved by train_punkt/save_punkt_params
+    :param params: PunktParameters to use instead of `params_path` (default for both: pretrained English)
+    :param n_workers: Worker processes (default: CPU count); 1 segments in this process
+    :param chunk_chars: Target characters per chunk sent to a worker
+    """
+    def __init__(self, params_path=None, params=None, n_workers=None, chunk_chars=CHUNK_CHARS):
+        self.params_json = None
+        if params_path is not None:
+            with open(params_path, "r", encoding="utf-8") as f:
+                self.params_json = f.read()
+        elif params is not None:
+            self.params_json = punkt_params_to_json(params)
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.chunk_chars = chunk_chars
+        self.tokenizer = _build_tokenizer(self.params_json)
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker,
+                                                 initargs=(self.params_json,))
+        return self._executor
+
+    def span_tokenize(self, text):
+        """
+        Segment `text` into sentences.
+
+        :param text: Input text
+        :return: int64 array of shape (sentences, 2) with start and end character offsets
+        """
+        start = time.perf_counter()
+        chunks = paragraph_chunks(text, self.chunk_chars)
+        if self.n_workers == 1 or len(chunks) <= 1:
+            spans = _span_paragraphs(self.tokenizer, text)
+        else:
+            results = self._pool().map(_segment_chunk, (text[a:b] for a, b in chunks), (a for a, _ in chunks))
+            spans = np.concatenate(list(results))
+        metrics.record("sentence_segmenter", len(spans), time.perf_counter() - start)
+        return spans
+
+    def tokenize(self, text):
+        """
+        Segment `text` and return the sentences as strings.
+
+        :param text: Input text
+        :return: List of sentences
+        """
+        return [text[s:e] for s, e in self.span_tokenize(text)]
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# Example usage
+if __name__ == "__main__":
+    import tempfile
+
+    repo_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    training_texts = []
+    for name in ["Readme.md", os.path.join("Tokenization-Pipeline", "Working.md")]:
+        with open(os.path.join(repo_dir, name), "r", encoding="utf-8") as f:
+            training_texts.append(f.read())
+
+    params_path = os.path.join(tempfile.mkdtemp(), "punkt_params.json")
+    params = train_punkt(training_texts, path=params_path)
+    print("Learned abbreviations:", sorted(params.abbrev_types)[:10])
+
+    sample_text = "Dr. Smith arrived at 9 a.m. on Jan. 5. He met Mr. Jones at the embassy.\n\nThe GT-R is fast. It is known as Godzilla."
+    corpus_text = "\n\n".join(training_texts * 500)
+
+    with SentenceSegmenter(params_path=params_path, n_workers=1) as serial, \
+         SentenceSegmenter(params_path=params_path, chunk_chars=256 * 1024) as parallel:
+        print("Sentence spans:", serial.span_tokenize(sample_text).tolist())
+        print("Sentences:", serial.tokenize(sample_text))
+        for name, segmenter in [("serial", serial), ("parallel", parallel)]:
+            start = time.perf_counter()
+            spans = segmenter.span_tokenize(corpus_text)
+            elapsed = time.perf_counter() - start
+            print(f"{name}: {len(spans)} sentences from {len(corpus_text) / 1e6:.1f}M chars in {elapsed:.2f}s "
+                  f"({segmenter.n_workers} workers)")
@@ -1,6 +1,12 @@
-import nltk
-from nltk.tokenize import TreebankWordTokenizer, WordPunctTokenizer, RegexpTokenizer, TweetTokenizer, PunktSentenceTokenizer, WhitespaceTokenizer
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+import hashlib
+import heapq
+import os
+import numpy as np
+
+from tokenization_metrics import metrics
 
 # Sample text for tokenization
 text = "He  He said, 'Hello!' #greeting @someone 😊 How are you?"
@@ -30,56 +36,326 @@ def displayTokenizationResults(tokenizer_name, tokens):
         print(token)
   
   
-# 1. TreebankWordTokenizer - Tokenizes text based on the Penn Treebank conventions.
-treebank_tokenizer = TreebankWordTokenizer()
-treebank_tokens = treebank_tokenizer.tokenize(text)
-displayTokenizationResults("TreebankWordTokenizer", treebank_tokens)
+# Tokenizer registry: name -> (display label, nltk.tokenize class, constructor args).
+# NLTK is imported and each tokenizer constructed once, on first use, and shared by every call.
+TOKENIZERS = {
+    # 1. TreebankWordTokenizer - Tokenizes text based on the Penn Treebank conventions.
+    "treebank": ("TreebankWordTokenizer", "TreebankWordTokenizer", ()),
+    # 2. WordPunctTokenizer - Splits text into words and punctuation.
+    "wordpunct": ("WordPunctTokenizer", "WordPunctTokenizer", ()),
+    # 3. RegexpTokenizer - Tokenizes using regular expressions.
+    "regexp": ("RegexpTokenizer (only words)", "RegexpTokenizer", (r'\w+',)),
+    # 4. TweetTokenizer - Handles tokenization of tweets (hashtags, mentions, emojis).
+    "tweet": ("TweetTokenizer", "TweetTokenizer", ()),
+    # 5. SentTokenizer (Punkt) - Splits text into sentences.
+    "punkt": ("SentTokenizer (Punkt)", "PunktSentenceTokenizer", ()),
+    # 6. WhitespaceTokenizer - Splits text based on whitespaces.
+    "whitespace": ("WhitespaceTokenizer", "WhitespaceTokenizer", ()),
+}
+
+_tokenizer_instances = {}
 
-# 2. WordPunctTokenizer - Splits text into words and punctuation.
-wordpunct_tokenizer = WordPunctTokenizer()
-wordpunct_tokens = wordpunct_tokenizer.tokenize(text)
-displayTokenizationResults("WordPunctTokenizer", wordpunct_tokens)
+def getTokenizer(name):
+    """
+    Returns the shared instance of a registered tokenizer, constructing it on first use.
+    """
+    if name not in TOKENIZERS:
+        raise ValueError(f"Unknown tokenizer '{name}'. Expected one of: {', '.join(TOKENIZERS)}.")
+    if name not in _tokenizer_instances:
+        import nltk.tokenize
+        _, class_name, args = TOKENIZERS[name]
+        _tokenizer_instances[name] = getattr(nltk.tokenize, class_name)(*args)
+    return _tokenizer_instances[name]
 
-# 3. RegexpTokenizer - Tokenizes using regular expressions.
-regexp_tokenizer = RegexpTokenizer(r'\w+')
-regexp_tokens = regexp_tokenizer.tokenize(text)
-displayTokenizationResults("RegexpTokenizer (only words)", regexp_tokens)
+def spanTokenize(name, text):
+    """
+        Tokenizes `text` into character offsets instead of strings.
+          Args:
+              name: A key of TOKENIZERS.
+              text: The document to tokenize.
+          Returns:
+              An (n_tokens, 2) int32 array of [start, end) offsets into `text`. Empty (and counted as an
+              error in tokenization_metrics) when the tokens cannot be aligned back onto `text`.
+    """
+    tokenizer = getTokenizer(name)
+    try:
+        spans = list(tokenizer.span_tokenize(text))
+    except NotImplementedError:
+        # TweetTokenizer has no span_tokenize; align its tokens back onto the text
+        try:
+            spans = _alignTokens(tokenizer.tokenize(text), text)
+        except ValueError:
+            metrics.record_error(f"spanTokenize:{name}")
+            spans = []
+    return np.array(spans, dtype=np.int32).reshape(-1, 2)
 
-# 4. TweetTokenizer - Handles tokenization of tweets (hashtags, mentions, emojis).
-tweet_tokenizer = TweetTokenizer()
-tweet_tokens = tweet_tokenizer.tokenize(text)
-displayTokenizationResults("TweetTokenizer", tweet_tokens)
+def _alignTokens(tokens, text):
+    """
+    Aligns tokens that were produced from the HTML-entity-decoded text (as TweetTokenizer does)
+    back onto `text`. A decoded character maps to the whole entity it came from. Raises
+    ValueError if the tokens still cannot be aligned.
+    """
+    from nltk.tokenize.casual import ENT_RE, _replace_html_entities
+    from nltk.tokenize.util import align_tokens
 
-# 5. SentTokenizer (Punkt) - Splits text into sentences.
-sent_tokenizer = PunktSentenceTokenizer()
-sentences = sent_tokenizer.tokenize(text)
-displayTokenizationResults("SentTokenizer (Punkt)", sentences)
+    decoded, starts, ends = [], [], []
+    position = 0
+    for match in ENT_RE.finditer(text):
+        for i in range(position, match.start()):
+            decoded.append(text[i])
+            starts.append(i)
+            ends.append(i + 1)
+        for char in _replace_html_entities(match.group()):
+            decoded.append(char)
+            starts.append(match.start())
+            ends.append(match.end())
+        position = match.end()
+    if position == 0:
+        decoded_text = text
+    else:
+        for i in range(position, len(text)):
+            decoded.append(text[i])
+            starts.append(i)
+            ends.append(i + 1)
+        decoded_text = "".join(decoded)
 
-# 6. WhitespaceTokenizer - Splits text based on whitespaces.
-whitespace_tokenizer = WhitespaceTokenizer()
-whitespace_tokens = whitespace_tokenizer.tokenize(text)
-displayTokenizationResults("WhitespaceTokenizer", whitespace_tokens)
+    spans = align_tokens(tokens, decoded_text)
+    if decoded_text is text:
+        return spans
+    return [(starts[start], ends[end - 1]) for start, end in spans if end > start]
 
-def displayTokenFrequency(tokens):
+class TokenSpans:
     """
-    Displays the frequency of each token in a formatted manner.
+    Token offsets for a batch of documents in CSR layout: the spans of document i are
+    spans[doc_offsets[i]:doc_offsets[i + 1]], each row a [start, end) pair into that document.
     """
-    token_counts = Counter(tokens)
-    print("\nToken Frequencies:")
-    print("-------------------")
-    for token, count in token_counts.items():
-        print(f"{token}: {count}") # Data for visualization
-    tokens, counts = zip(*token_counts.items())
+    def __init__(self, spans, doc_offsets):
+        self.spans = spans
+        self.doc_offsets = doc_offsets
+
+    def __len__(self):
+        return len(self.doc_offsets) - 1
+
+    def __getitem__(self, i):
+        return self.spans[self.doc_offsets[i]:self.doc_offsets[i + 1]]
+
+    def tokens(self, i, text):
+        """
+        Materialises the token strings of document i (only when they are actually needed).
+        """
+        return [text[start:end] for start, end in self[i]]
+
+def _spans_for_batch(names, documents):
+    results = {}
+    for name in names:
+        per_doc = [spanTokenize(name, document) for document in documents]
+        doc_offsets = np.zeros(len(per_doc) + 1, dtype=np.int64)
+        np.cumsum([len(spans) for spans in per_doc], out=doc_offsets[1:])
+        spans = np.concatenate(per_doc) if per_doc else np.empty((0, 2), dtype=np.int32)
+        results[name] = TokenSpans(spans, doc_offsets)
+    return results
 
-    # Plotting the token frequency bar chart
+def compareTokenizers(documents, names=None, batch_size=1000, executor=None, n_workers=None):
+    """
+        Runs a subset of the registered tokenizers over a batch or stream of documents.
+          Args:
+              documents: An iterable of strings; consumed lazily in batches of `batch_size`.
+              names: Keys of TOKENIZERS to run (default: all).
+              batch_size: Documents per batch.
+              executor: None to run inline, "thread" or "process" to spread batches over a pool.
+              n_workers: Pool size when `executor` is set.
+          Yields:
+              One {name: TokenSpans} dict per batch, in input order.
+    """
+    names = list(names or TOKENIZERS)
+    for name in names:
+        getTokenizer(name)  # fail fast on unknown names
+    documents = iter(documents)
+    batches = iter(lambda: list(islice(documents, batch_size)), [])
+
+    if executor is None:
+        for batch in batches:
+            yield _spans_for_batch(names, batch)
+        return
+
+    if executor not in ("thread", "process"):
+        raise ValueError("`executor` must be None, 'thread' or 'process'.")
+    pool_class = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+    n_workers = n_workers or os.cpu_count() or 1
+    with pool_class(max_workers=n_workers) as pool:
+        # Bounded in-flight batches keep memory flat on unbounded streams while preserving order
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(_spans_for_batch, names, batch))
+            if len(pending) >= 2 * n_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+class CountMinSketch:
+    """
+    Count-Min Sketch: fixed-size (depth x width) counter table giving over-estimates of token counts.
+    Hashing uses blake2b so sketches built in different processes can be merged.
+    """
+    def __init__(self, width=2**16, depth=4):
+        if not 1 <= depth <= 8:
+            raise ValueError("`depth` must be between 1 and 8.")
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    def _indexes(self, token):
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=4 * self.depth).digest()
+        return [int.from_bytes(digest[4 * row:4 * row + 4], "little") % self.width for row in range(self.depth)]
+
+    def update(self, token_counts):
+        rows = np.arange(self.depth)
+        for token, count in token_counts.items():
+            self.table[rows, self._indexes(token)] += count
+
+    def estimate(self, token):
+        return int(self.table[np.arange(self.depth), self._indexes(token)].min())
+
+    def merge(self, other):
+        self.table += other.table
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy hitters with at most `capacity` counters. Counts are over-estimates by at most the
+    smallest retained count; summaries from different shards are merged by adding counts and keeping the top.
+    """
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self.counts = {}
+
+    def min_count(self):
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def update(self, token_counts, floor=0):
+        # `floor` is the other summary's min count: any token it dropped may have occurred up to that often
+        own_floor = self.min_count()
+        merged = {}
+        for token in self.counts.keys() | token_counts.keys():
+            merged[token] = self.counts.get(token, own_floor) + token_counts.get(token, floor)
+        if len(merged) > self.capacity:
+            merged = dict(heapq.nlargest(self.capacity, merged.items(), key=lambda item: item[1]))
+        self.counts = merged
+
+    def merge(self, other):
+        self.update(other.counts, floor=other.min_count())
+
+    def top(self, k):
+        return heapq.nlargest(k, self.counts.items(), key=lambda item: item[1])
+
+
+def _count_shard(tokenizer, documents, approximate, capacity, sketch_width, sketch_depth):
+    # Registered tokenizers travel by name and are rebuilt from the registry in the worker; the regexp-based
+    # NLTK tokenizers cannot be unpickled once their compiled pattern has been used
+    if isinstance(tokenizer, str):
+        tokenizer = getTokenizer(tokenizer)
+    counts = Counter()
+    for document in documents:
+        counts.update(tokenizer.tokenize(document))
+    if not approximate:
+        return counts
+
+    summary = SpaceSaving(capacity)
+    summary.update(counts)
+    sketch = CountMinSketch(sketch_width, sketch_depth)
+    sketch.update(counts)
+    return summary, sketch
+
+
+def countTokenFrequencies(documents, tokenizer=None, top_k=20, approximate=False, capacity=10000,
+                          shard_size=10000, n_workers=None, sketch_width=2**16, sketch_depth=4):
+    """
+        Counts token frequencies over a (possibly very large) stream of documents.
+          Args:
+              documents: An iterable of strings; consumed lazily in shards of `shard_size` documents.
+              tokenizer: A key of TOKENIZERS or any object with a `tokenize` method (default: "treebank").
+              top_k: Number of most frequent tokens to return.
+              approximate: If True, keep memory bounded with Space-Saving heavy hitters and a Count-Min Sketch.
+              capacity: Number of counters kept by Space-Saving in approximate mode.
+              shard_size: Documents per shard counted by one worker.
+              n_workers: Worker processes; 1 counts in the current process.
+          Returns:
+              A list of (token, count) pairs, most frequent first. Approximate counts are upper bounds.
+    """
+    if tokenizer is None or isinstance(tokenizer, str):
+        tokenizer = tokenizer or "treebank"
+        getTokenizer(tokenizer)  # fail fast on unknown names
+    documents = iter(documents)
+    shards = iter(lambda: list(islice(documents, shard_size)), [])
+    args = (approximate, capacity, sketch_width, sketch_depth)
+
+    totals = Counter()
+    summary = SpaceSaving(capacity)
+    sketch = CountMinSketch(sketch_width, sketch_depth)
+
+    def merge(result):
+        if approximate:
+            summary.merge(result[0])
+            sketch.merge(result[1])
+        else:
+            totals.update(result)
+
+    if n_workers == 1:
+        for shard in shards:
+            merge(_count_shard(tokenizer, shard, *args))
+    else:
+        n_workers = n_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            # Keep a bounded number of shards in flight so the document stream is never materialised
+            max_in_flight = 2 * n_workers
+            pending = []
+            for shard in shards:
+                pending.append(executor.submit(_count_shard, tokenizer, shard, *args))
+                if len(pending) >= max_in_flight:
+                    merge(pending.pop(0).result())
+            for future in pending:
+                merge(future.result())
+
+    if not approximate:
+        return totals.most_common(top_k)
+    # Both structures over-estimate, so the smaller of the two is the tighter bound
+    return sorted(((token, min(count, sketch.estimate(token))) for token, count in summary.top(top_k)),
+                  key=lambda item: item[1], reverse=True)
+
+
+def plotTokenFrequencies(token_counts, title='Token Frequencies'):
+    """
+    Plots a bar chart of (token, count) pairs, e.g. the top-K returned by countTokenFrequencies.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    tokens, counts = zip(*token_counts)
     plt.figure(figsize=(10, 6))
     sns.barplot(x=list(tokens), y=list(counts), palette="viridis")
     plt.xlabel('Tokens')
     plt.ylabel('Frequency')
-    plt.title('Token Frequencies')
+    plt.title(title)
     plt.xticks(rotation=45)
     plt.show()
 
-# Display token frequencies and visualize for Treebank tokenizer
 
-displayTokenFrequency(treebank_tokens)
+def displayTokenFrequency(tokens, top_k=20):
+    """
+    Displays the frequency of the `top_k` most common tokens in a formatted manner.
+    """
+    token_counts = Counter(tokens).most_common(top_k)
+    print("\nToken Frequencies:")
+    print("-------------------")
+    for token, count in token_counts:
+        print(f"{token}: {count}") # Data for visualization
+
+    # Plotting the token frequency bar chart (top-K only)
+    plotTokenFrequencies(token_counts)
+
+if __name__ == "__main__":
+    for name, (label, _, _) in TOKENIZERS.items():
+        displayTokenizationResults(label, getTokenizer(name).tokenize(text))
+
+    # Display token frequencies and visualize for Treebank tokenizer
+    displayTokenFrequency(getTokenizer("treebank").tokenize(text))
@@ -2,6 +2,15 @@
 
 # Works independently of language and doesn't rely on whitespace, making it useful for languages with no clear word boundaries.
 
-import sentencepiece as spm
-sp = spm.SentencePieceProcessor(model_file='m.model')
-tokens = sp.encode('This is a sentence.', out_type=str)
+from functools import lru_cache
+
+@lru_cache(maxsize=None)
+def load_processor(model_file='m.model'):
+    # sentencepiece and the model file are loaded on first use
+    import sentencepiece as spm
+    return spm.SentencePieceProcessor(model_file=model_file)
+
+if __name__ == "__main__":
+    sp = load_processor('m.model')
+    tokens = sp.encode('This is a sentence.', out_type=str)
+    print(tokens)
@@ -2,7 +2,61 @@
 
 # Offers multilingual support.
 
-import stanza
-nlp = stanza.Pipeline(lang='en', processors='tokenize')
-doc = nlp("This is a sentence.")
-tokens = [word.text for sentence in doc.sentences for word in sentence.words]
+from functools import lru_cache
+from itertools import islice
+import time
+from nlp_resources import OFFLINE
+from tokenization_metrics import metrics
+
+@lru_cache(maxsize=None)
+def load_pipeline(lang='en', processors='tokenize', tokenize_batch_size=32):
+    # stanza and its models are loaded on first use; in offline mode missing models raise instead of downloading
+    import stanza
+    if OFFLINE:
+        return stanza.Pipeline(lang=lang, processors=processors, tokenize_batch_size=tokenize_batch_size, download_method=None)
+    return stanza.Pipeline(lang=lang, processors=processors, tokenize_batch_size=tokenize_batch_size)
+
+def stanza_tokenize(text, lang='en'):
+    doc = load_pipeline(lang)(text)
+    return [word.text for sentence in doc.sentences for word in sentence.words]
+
+class StanzaTokenizerService:
+    """
+    Long-lived Stanza tokenizer: the tokenize-only pipeline is loaded once per worker and texts are sent
+    through it in bulk (a list of Documents per call) instead of one Pipeline call per string.
+    """
+    def __init__(self, lang='en', batch_size=256, tokenize_batch_size=32):
+        self.nlp = load_pipeline(lang, 'tokenize', tokenize_batch_size)
+        self.batch_size = batch_size
+        self.metrics_name = f"stanza:{lang}"
+
+    def tokenize_batch(self, texts):
+        """
+        Tokenize a list or stream of texts, yielding one token list per text in input order.
+        """
+        import stanza
+
+        texts = iter(texts)
+        while True:
+            batch = list(islice(texts, self.batch_size))
+            if not batch:
+                break
+            start = time.perf_counter()
+            docs = self.nlp([stanza.Document([], text=text) for text in batch])
+            results = [[word.text for sentence in doc.sentences for word in sentence.words] for doc in docs]
+            metrics.record(self.metrics_name, sum(map(len, results)), time.perf_counter() - start, len(results))
+            yield from results
+
+    def stats(self):
+        """
+        Documents, tokens and throughput processed by this pipeline so far.
+        """
+        return metrics.throughput(self.metrics_name)
+
+if __name__ == "__main__":
+    tokens = stanza_tokenize("This is a sentence.")
+    print(tokens)
+
+    service = StanzaTokenizerService()
+    results = list(service.tokenize_batch(["This is a sentence."] * 1000))
+    print(results[0], service.stats())
@@ -1,5 +1,20 @@
+import tokenizers
 from tokenizers import Tokenizer, models, pre_tokenizers, trainers
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from array import array
+from collections import Counter
+import heapq
+from itertools import islice
+import numpy as np
+import gzip
+import hashlib
 import json
+import mmap
+import os
+import re
+import struct
+import sys
+import time
 
 # Data Corpus
 corpus = [
@@ -13,68 +28,425 @@ corpus = [
 # To test Tokenisation
 text = "The Nissan GT-R, also known as Godzilla, is one of Japan's most iconic sports cars with remarkable speed and precision."
 
-# 1. BPE Tokenizer
-def bpe_tokenizer(corpus, text):
+SPECIAL_TOKENS = ["[UNK]", "[CLS]", "[SEP]", "[PAD]", "[MASK]"]
+
+BPE_PARAMS = {"vocab_size": 100, "min_frequency": 2, "special_tokens": SPECIAL_TOKENS}
+UNIGRAM_PARAMS = {"vocab_size": 100, "special_tokens": SPECIAL_TOKENS, "unk_token": "[UNK]"}
+WORDLEVEL_PARAMS = {"vocab_size": 100, "special_tokens": SPECIAL_TOKENS}
+WORDPIECE_PARAMS = {"vocab_size": 100, "special_tokens": SPECIAL_TOKENS}
+
+# Trained tokenizers are cached as JSON artifacts keyed on (model type, trainer params, corpus hash)
+CACHE_DIR = os.environ.get("TOKENIZER_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".tokenizer_cache"))
+CACHE_MAX_ENTRIES = 64
+CACHE_MAX_AGE_SECONDS = 30 * 24 * 3600
+# Names written by artifact_path; eviction only ever touches files named like this
+ARTIFACT_NAME = re.compile(r"[a-z0-9]+-[0-9a-f]{32}\.json")
+
+def corpus_hash(corpus):
+    digest = hashlib.sha256()
+    for line in corpus:
+        digest.update(line.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+def artifact_path(model_type, params, corpus_digest, cache_dir=CACHE_DIR):
+    key = json.dumps({"model": model_type, "params": params, "corpus": corpus_digest, "tokenizers": tokenizers.__version__}, sort_keys=True)
+    return os.path.join(cache_dir, f"{model_type.lower()}-{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.json")
+
+def evict_stale_artifacts(cache_dir=CACHE_DIR, max_entries=CACHE_MAX_ENTRIES, max_age=CACHE_MAX_AGE_SECONDS):
+    # Drop artifacts not used within max_age, then the least recently used ones beyond max_entries
+    if not os.path.isdir(cache_dir):
+        return []
+    # Other workers may evict concurrently, so files can disappear between listing, stat and remove
+    now = time.time()
+    mtimes = {}
+    for name in os.listdir(cache_dir):
+        if ARTIFACT_NAME.fullmatch(name):
+            path = os.path.join(cache_dir, name)
+            try:
+                mtimes[path] = os.path.getmtime(path)
+            except FileNotFoundError:
+                continue
+    artifacts = sorted(mtimes, key=mtimes.get, reverse=True)
+    evicted = [path for path in artifacts if now - mtimes[path] > max_age]
+    kept = [path for path in artifacts if path not in evicted]
+    evicted += kept[max_entries:]
+    for path in evicted:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    return evicted
+
+def load_or_train(model_type, params, corpus, train_fn, use_cache=True, cache_dir=CACHE_DIR):
+    if not use_cache:
+        return train_fn(corpus)
+
+    # The corpus is read twice (hash, then training), so a one-shot iterator must be materialised first
+    if not isinstance(corpus, (list, tuple)):
+        corpus = list(corpus)
+    path = artifact_path(model_type, params, corpus_hash(corpus), cache_dir)
+    if os.path.exists(path):
+        os.utime(path)  # mark as recently used for eviction
+        return Tokenizer.from_file(path)
+
+    tokenizer = train_fn(corpus)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    tokenizer.save(tmp_path)
+    os.replace(tmp_path, path)  # atomic, so concurrent workers never read a partial artifact
+    evict_stale_artifacts(cache_dir)
+    return tokenizer
+
+def _train_bpe(corpus):
     tokenizer = Tokenizer(models.BPE(unk_token="[UNK]"))
     tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
-
-    trainer = trainers.BpeTrainer(vocab_size=100, min_frequency=2, special_tokens=["[UNK]", "[CLS]", "[SEP]", "[PAD]", "[MASK]"])
+    trainer = trainers.BpeTrainer(**BPE_PARAMS)
     tokenizer.train_from_iterator(corpus, trainer)
-
-    tokens = tokenizer.encode(text).tokens
-    print("BPE Tokenizer Output:\n", tokens, "\n")
     return tokenizer
 
-# 2. Unigram Tokenizer
-def unigram_tokenizer(corpus, text):
+def _train_unigram(corpus):
     tokenizer = Tokenizer(models.Unigram())
     tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    # unk_token on the trainer sets the model's unk_id directly, no JSON patching needed
+    trainer = trainers.UnigramTrainer(**UNIGRAM_PARAMS)
+    tokenizer.train_from_iterator(corpus, trainer)
+    return tokenizer
 
-    trainer = trainers.UnigramTrainer(vocab_size=100, special_tokens=["[UNK]", "[CLS]", "[SEP]", "[PAD]", "[MASK]"])
+def _train_wordlevel(corpus):
+    tokenizer = Tokenizer(models.WordLevel(unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    trainer = trainers.WordLevelTrainer(**WORDLEVEL_PARAMS)
     tokenizer.train_from_iterator(corpus, trainer)
+    return tokenizer
 
-    tokenizer.save("unigram_tokenizer.json")
-    with open("unigram_tokenizer.json", "r") as f:
-        tokenizer_data = json.load(f)
-        tokenizer_data["model"]["unk_id"] = tokenizer.token_to_id("[UNK]")
+def _train_wordpiece(corpus):
+    tokenizer = Tokenizer(models.WordPiece(unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    trainer = trainers.WordPieceTrainer(**WORDPIECE_PARAMS)
+    tokenizer.train_from_iterator(corpus, trainer)
+    return tokenizer
+
+# 1. BPE Tokenizer
+def bpe_tokenizer(corpus, text, use_cache=True):
+    tokenizer = load_or_train("BPE", BPE_PARAMS, corpus, _train_bpe, use_cache)
+
+    tokens = tokenizer.encode(text).tokens
+    print("BPE Tokenizer Output:\n", tokens, "\n")
+    return tokenizer
+
+# 2. Unigram Tokenizer
+def unigram_tokenizer(corpus, text, use_cache=True):
+    tokenizer = load_or_train("Unigram", UNIGRAM_PARAMS, corpus, _train_unigram, use_cache)
 
-    tokenizer = Tokenizer.from_str(json.dumps(tokenizer_data))
     tokens = tokenizer.encode(text).tokens
     print("Unigram Tokenizer Output:\n", tokens, "\n")
     return tokenizer
 
 # 3. WordLevel Tokenizer
-def wordlevel_tokenizer(corpus, text):
-    tokenizer = Tokenizer(models.WordLevel(unk_token="[UNK]"))
-    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
-
-    trainer = trainers.WordLevelTrainer(vocab_size=100, special_tokens=["[UNK]", "[CLS]", "[SEP]", "[PAD]", "[MASK]"])
-    tokenizer.train_from_iterator(corpus, trainer)
+def wordlevel_tokenizer(corpus, text, use_cache=True):
+    tokenizer = load_or_train("WordLevel", WORDLEVEL_PARAMS, corpus, _train_wordlevel, use_cache)
 
     tokens = tokenizer.encode(text).tokens
     print("WordLevel Tokenizer Output:\n", tokens, "\n")
     return tokenizer
 
 # 4. WordPiece Tokenizer
-def wordpiece_tokenizer(corpus, text):
-    tokenizer = Tokenizer(models.WordPiece(unk_token="[UNK]"))
-    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
-
-    trainer = trainers.WordPieceTrainer(vocab_size=100, special_tokens=["[UNK]", "[CLS]", "[SEP]", "[PAD]", "[MASK]"])
-    tokenizer.train_from_iterator(corpus, trainer)
+def wordpiece_tokenizer(corpus, text, use_cache=True):
+    tokenizer = load_or_train("WordPiece", WORDPIECE_PARAMS, corpus, _train_wordpiece, use_cache)
 
     tokens = tokenizer.encode(text).tokens
     print("WordPiece Tokenizer Output:\n", tokens, "\n")
     return tokenizer
 
+# Streaming training over a directory of .txt / .jsonl / .gz files larger than RAM
+TRAINERS = {
+    "BPE": _train_bpe,
+    "Unigram": _train_unigram,
+    "WordLevel": _train_wordlevel,
+    "WordPiece": _train_wordpiece,
+}
+
+TRAINER_PARAMS = {
+    "BPE": BPE_PARAMS,
+    "Unigram": UNIGRAM_PARAMS,
+    "WordLevel": WORDLEVEL_PARAMS,
+    "WordPiece": WORDPIECE_PARAMS,
+}
+
+def _iter_text_lines(path, use_mmap=False):
+    if path.endswith(".gz"):
+        with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
+            yield from f
+    elif use_mmap and os.path.getsize(path) > 0:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b""):
+                yield line.decode("utf-8", errors="replace")
+    else:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            yield from f
+
+def iter_corpus_files(corpus_dir, use_mmap=False, text_field="text"):
+    for root, dirs, files in os.walk(corpus_dir):
+        dirs.sort()  # walk subdirectories in a fixed order so the training order is reproducible
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            is_jsonl = name.endswith((".jsonl", ".jsonl.gz"))
+            if not (is_jsonl or name.endswith((".txt", ".txt.gz"))):
+                continue
+
+            skipped = 0
+            for line in _iter_text_lines(path, use_mmap):
+                if is_jsonl:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    # One malformed record must not abort a long training run: skip it and report the count
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        record = None
+                    line = record.get(text_field, "") if isinstance(record, dict) else None
+                    if not isinstance(line, str):
+                        skipped += 1
+                        continue
+                line = line.rstrip("\n")
+                if line:
+                    yield line
+            if skipped:
+                print(f"Skipped {skipped} lines of {path} that are not JSON objects with a string '{text_field}' field")
+
+def iter_corpus_chunks(lines, chunk_length=1000):
+    # train_from_iterator accepts batches of strings, which keeps the Rust side busy per Python call
+    lines = iter(lines)
+    while True:
+        chunk = list(islice(lines, chunk_length))
+        if not chunk:
+            break
+        yield chunk
+
+def peak_rss_mb():
+    # resource is Unix-only (psutil is the fallback elsewhere); ru_maxrss is KiB on Linux but bytes on macOS
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        memory = psutil.Process().memory_info()
+        return getattr(memory, "peak_wset", memory.rss) / (1024 * 1024)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def train_from_files(corpus_dir, model_types=("BPE", "Unigram", "WordPiece"), chunk_length=1000, use_mmap=False):
+    trained = {}
+    total_lines = 0
+    start = time.perf_counter()
+
+    for model_type in model_types:
+        counter = {"lines": 0}
+
+        def counted_chunks():
+            for chunk in iter_corpus_chunks(iter_corpus_files(corpus_dir, use_mmap), chunk_length):
+                counter["lines"] += len(chunk)
+                yield chunk
+
+        trained[model_type] = TRAINERS[model_type](counted_chunks())
+        total_lines += counter["lines"]
+
+    elapsed = time.perf_counter() - start
+    peak = peak_rss_mb()
+    peak_text = f"{peak:.1f} MB" if peak is not None else "n/a"
+    print(f"Streamed {total_lines} lines in {elapsed:.2f}s ({total_lines / max(elapsed, 1e-9):.0f} lines/sec), peak RSS {peak_text}")
+    return trained
+
+# Parallel training: one process per model, results returned as serialized JSON
+def _train_worker(model_type, corpus_source, use_cache, chunk_length):
+    # A str source is a corpus directory each worker streams on its own; anything else is an in-memory corpus
+    if isinstance(corpus_source, str):
+        tokenizer = TRAINERS[model_type](iter_corpus_chunks(iter_corpus_files(corpus_source), chunk_length))
+    else:
+        tokenizer = load_or_train(model_type, TRAINER_PARAMS[model_type], corpus_source, TRAINERS[model_type], use_cache)
+    return model_type, tokenizer.to_str()
+
+def train_parallel(corpus_source, model_types=("BPE", "Unigram", "WordLevel", "WordPiece"), max_workers=None, use_cache=True, chunk_length=1000):
+    max_workers = max_workers or min(len(model_types), os.cpu_count() or 1)
+    trained = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_train_worker, model_type, corpus_source, use_cache, chunk_length) for model_type in model_types]
+        for future in as_completed(futures):
+            model_type, tokenizer_json = future.result()
+            trained[model_type] = Tokenizer.from_str(tokenizer_json)
+    return {model_type: trained[model_type] for model_type in model_types}
+
+# Incremental BPE / WordPiece training: word frequencies are persisted between runs and only new documents
+# are pre-tokenized and counted; merges are then re-derived from the stored counts (cost grows with the number
+# of distinct words, not with the corpus). The merge loop mirrors tokenizers' BpeTrainer, so a BPE model built
+# from the accumulated counts equals one trained on the full corpus.
+# The state is not a cache artifact (it cannot be rebuilt without the old documents), so it lives outside CACHE_DIR
+STATE_DIR = os.environ.get("TOKENIZER_STATE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".tokenizer_state"))
+INCREMENTAL_STATE_PATH = os.path.join(STATE_DIR, "incremental_state.json")
+
+def load_incremental_state(path=INCREMENTAL_STATE_PATH):
+    if not os.path.exists(path):
+        return {"word_counts": Counter(), "documents": 0, "deltas": [], "vocabs": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    state["word_counts"] = Counter(state["word_counts"])
+    return state
+
+def save_incremental_state(state, path=INCREMENTAL_STATE_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(dict(state, word_counts=dict(state["word_counts"])), f)
+    os.replace(tmp_path, path)
+
+def count_words(documents, word_counts=None):
+    # Same pre-tokenization as the trainers, so the counts match what train_from_iterator would see
+    word_counts = Counter() if word_counts is None else word_counts
+    pre_tokenizer = pre_tokenizers.Whitespace()
+    for document in documents:
+        word_counts.update(word for word, _ in pre_tokenizer.pre_tokenize_str(document))
+    return word_counts
+
+def derive_bpe_vocab(word_counts, vocab_size, special_tokens=(), min_frequency=0, continuing_subword_prefix=None):
+    # Returns (vocab {token: id}, merges [(left, right), ...]) exactly as BpeTrainer would for these counts
+    vocab, id_to_token = {}, []
+
+    def add_token(token):
+        if token not in vocab:
+            vocab[token] = len(id_to_token)
+            id_to_token.append(token)
+        return vocab[token]
+
+    for token in special_tokens:
+        add_token(token)
+    for char in sorted({char for word in word_counts for char in word}, key=ord):
+        add_token(char)
+
+    # Words in sorted order keep the ids of "##"-prefixed characters deterministic
+    words, counts = [], []
+    for word in sorted(word_counts):
+        symbols = [add_token(char if i == 0 or continuing_subword_prefix is None else continuing_subword_prefix + char)
+                   for i, char in enumerate(word)]
+        words.append(symbols)
+        counts.append(word_counts[word])
+
+    pair_counts, where_to_update = Counter(), {}
+    for index, symbols in enumerate(words):
+        for pair in zip(symbols, symbols[1:]):
+            pair_counts[pair] += counts[index]
+            where_to_update.setdefault(pair, set()).add(index)
+
+    # Max-heap on (count, then smallest pair); stale entries are refreshed when popped
+    queue, sequence = [], 0
+    def push_updates():
+        nonlocal sequence
+        for pair, positions in where_to_update.items():
+            if pair_counts[pair] > 0:
+                heapq.heappush(queue, (-pair_counts[pair], pair, sequence, positions))
+                sequence += 1
+        where_to_update.clear()
+
+    push_updates()
+    merges = []
+    while len(vocab) < vocab_size and queue:
+        negative_count, pair, _, positions = heapq.heappop(queue)
+        if -negative_count != pair_counts[pair]:
+            heapq.heappush(queue, (-pair_counts[pair], pair, sequence, positions))
+            sequence += 1
+            continue
+        if -negative_count < 1 or -negative_count < min_frequency:
+            break
+
+        left, right = id_to_token[pair[0]], id_to_token[pair[1]]
+        if continuing_subword_prefix and right.startswith(continuing_subword_prefix):
+            right = right[len(continuing_subword_prefix):]
+        new_id = add_token(left + right)
+        merges.append((id_to_token[pair[0]], id_to_token[pair[1]]))
+
+        for index in positions:
+            symbols, i = words[index], 0
+            while i < len(symbols) - 1:
+                if symbols[i] == pair[0] and symbols[i + 1] == pair[1]:
+                    symbols[i:i + 2] = [new_id]
+                    changes = []
+                    if i > 0:
+                        changes += [((symbols[i - 1], pair[0]), -1), ((symbols[i - 1], new_id), 1)]
+                    if i < len(symbols) - 1:
+                        changes += [((pair[1], symbols[i + 1]), -1), ((new_id, symbols[i + 1]), 1)]
+                    for changed_pair, change in changes:
+                        pair_counts[changed_pair] += change * counts[index]
+                        if change > 0:
+                            where_to_update.setdefault(changed_pair, set()).add(index)
+                i += 1
+        push_updates()
+
+    return vocab, merges
+
+def _build_incremental(model_type, word_counts):
+    if model_type == "BPE":
+        vocab, merges = derive_bpe_vocab(word_counts, BPE_PARAMS["vocab_size"], SPECIAL_TOKENS, BPE_PARAMS["min_frequency"])
+        tokenizer = Tokenizer(models.BPE(vocab=vocab, merges=merges, unk_token="[UNK]"))
+    elif model_type == "WordPiece":
+        vocab, _ = derive_bpe_vocab(word_counts, WORDPIECE_PARAMS["vocab_size"], SPECIAL_TOKENS, continuing_subword_prefix="##")
+        tokenizer = Tokenizer(models.WordPiece(vocab=vocab, unk_token="[UNK]", continuing_subword_prefix="##"))
+    else:
+        raise ValueError(f"Incremental training supports BPE and WordPiece, not '{model_type}'.")
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.add_special_tokens(SPECIAL_TOKENS)
+    return tokenizer
+
+def train_incremental(new_documents, model_types=("BPE", "WordPiece"), state_path=INCREMENTAL_STATE_PATH):
+    # Fold new_documents into the persisted word counts and rebuild the tokenizers.
+    # Returns (tokenizers, report) where the report lists vocabulary changes against the previous run.
+    new_documents = list(new_documents)
+    state = load_incremental_state(state_path)
+    delta_hash = corpus_hash(new_documents)
+    if delta_hash in state["deltas"]:
+        print("These documents were already counted; rebuilding from the stored counts only.")
+    else:
+        start = time.perf_counter()
+        count_words(new_documents, state["word_counts"])
+        state["documents"] += len(new_documents)
+        state["deltas"].append(delta_hash)
+        print(f"Counted {len(new_documents)} new documents in {time.perf_counter() - start:.2f}s "
+              f"({state['documents']} total, {len(state['word_counts'])} distinct words)")
+
+    trained, report = {}, {}
+    for model_type in model_types:
+        tokenizer = _build_incremental(model_type, state["word_counts"])
+        vocab = tokenizer.get_vocab()
+        previous = set(state["vocabs"].get(model_type, []))
+        added = sorted(set(vocab) - previous, key=vocab.get)
+        removed = sorted(previous - set(vocab))
+        report[model_type] = {
+            "vocab_size": len(vocab),
+            "added": added if previous else [],
+            "removed": removed,
+            "changed_fraction": (len(added) + len(removed)) / max(len(previous), 1) if previous else 1.0,
+        }
+        print(f"{model_type}: vocab {len(vocab)}, +{len(report[model_type]['added'])} / -{len(removed)} tokens since the last run")
+        state["vocabs"][model_type] = sorted(vocab, key=vocab.get)
+        trained[model_type] = tokenizer
+
+    save_incremental_state(state, state_path)
+    return trained, report
+
 # Run the pipeline
-def run_tokenization_pipeline(corpus, text):
+def run_tokenization_pipeline(corpus, text, use_cache=True, parallel=False):
     print("Original Text:\n", text, "\n")
 
-    bpe = bpe_tokenizer(corpus, text)
-    unigram = unigram_tokenizer(corpus, text)
-    wordlevel = wordlevel_tokenizer(corpus, text)
-    wordpiece = wordpiece_tokenizer(corpus, text)
+    if parallel:
+        trained = train_parallel(corpus, use_cache=use_cache)
+        bpe, unigram, wordlevel, wordpiece = (trained[name] for name in ["BPE", "Unigram", "WordLevel", "WordPiece"])
+    else:
+        bpe = bpe_tokenizer(corpus, text, use_cache)
+        unigram = unigram_tokenizer(corpus, text, use_cache)
+        wordlevel = wordlevel_tokenizer(corpus, text, use_cache)
+        wordpiece = wordpiece_tokenizer(corpus, text, use_cache)
 
     # Basic Pipeline: Tokenize text, add special tokens for NLP tasks, and prepare input IDs
     tokenized_outputs = {}
@@ -93,6 +465,131 @@ def run_tokenization_pipeline(corpus, text):
 
     return tokenized_outputs
 
+# Batch Pipeline: encode an iterable of texts in fixed-size chunks
+def batch_encode(tokenizer, texts, batch_size=1024, max_length=128):
+    # Work on a copy so padding/truncation settings don't leak into the caller's tokenizer
+    tokenizer = Tokenizer.from_str(tokenizer.to_str())
+    pad_id = tokenizer.token_to_id("[PAD]")
+    tokenizer.enable_truncation(max_length=max_length)
+    tokenizer.enable_padding(length=max_length, pad_id=pad_id, pad_token="[PAD]")
+
+    texts = iter(texts)
+    while True:
+        chunk = list(islice(texts, batch_size))
+        if not chunk:
+            break
+
+        encodings = tokenizer.encode_batch(chunk)
+        input_ids = np.array([encoding.ids for encoding in encodings], dtype=np.int32)
+        attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int32)
+
+        yield {
+            "input_ids": input_ids,
+            "attention_mask": attention_mask
+        }
+
+def run_batch_tokenization_pipeline(corpus, texts, batch_size=1024, max_length=128, use_cache=True):
+    # Every model is trained on the same corpus, so a one-shot iterator is materialised once
+    if not isinstance(corpus, (list, tuple)):
+        corpus = list(corpus)
+    trained = {name: load_or_train(name, TRAINER_PARAMS[name], corpus, TRAINERS[name], use_cache)
+               for name in ["BPE", "Unigram", "WordLevel", "WordPiece"]}
+
+    # Yields (name, chunk) pairs; only one chunk per tokenizer is alive at a time.
+    # `texts` is consumed once per tokenizer, so pass a re-iterable (e.g. a list or a file-backed sequence).
+    for name, tokenizer in trained.items():
+        for chunk in batch_encode(tokenizer, texts, batch_size=batch_size, max_length=max_length):
+            yield name, chunk
+
+# Token-id corpus files: one flat binary file per encoded corpus, opened with np.memmap for zero-copy access
+#   header (128 bytes): magic, version, bytes per id (2 or 4), vocab size, document count, token count,
+#                       sha256 of the tokenizer JSON
+#   ids:     uint16 (vocab <= 65536) or uint32 token ids of all documents back to back
+#   offsets: int64, document count + 1 entries (8-byte aligned); document i is ids[offsets[i]:offsets[i + 1]]
+TOKEN_CORPUS_MAGIC = b"TOKCORP1"
+TOKEN_CORPUS_VERSION = 1
+TOKEN_CORPUS_HEADER = struct.Struct("<8sIIQQQ32s")
+TOKEN_CORPUS_HEADER_SIZE = 128
+
+def tokenizer_hash(tokenizer):
+    return hashlib.sha256(tokenizer.to_str().encode("utf-8")).hexdigest()
+
+def write_token_corpus(tokenizer, texts, path, batch_size=1024):
+    # Encode texts in batches without padding/truncation and stream the ids to disk; only offsets stay in memory
+    tokenizer = Tokenizer.from_str(tokenizer.to_str())
+    tokenizer.no_padding()
+    tokenizer.no_truncation()
+    vocab_size = tokenizer.get_vocab_size()
+    dtype = np.dtype(np.uint16 if vocab_size <= 2 ** 16 else np.uint32)
+    offsets = array("q", [0])
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(b"\0" * TOKEN_CORPUS_HEADER_SIZE)
+        for chunk in iter_corpus_chunks(texts, batch_size):
+            for encoding in tokenizer.encode_batch(chunk):
+                f.write(np.asarray(encoding.ids, dtype=dtype).tobytes())
+                offsets.append(offsets[-1] + len(encoding.ids))
+
+        num_docs, num_tokens = len(offsets) - 1, offsets[-1]
+        f.write(b"\0" * (-f.tell() % 8))
+        f.write(np.frombuffer(offsets, dtype=np.int64).tobytes())
+        f.seek(0)
+        f.write(TOKEN_CORPUS_HEADER.pack(TOKEN_CORPUS_MAGIC, TOKEN_CORPUS_VERSION, dtype.itemsize, vocab_size,
+                                         num_docs, num_tokens, bytes.fromhex(tokenizer_hash(tokenizer))))
+    os.replace(tmp_path, path)  # readers never see a half-written corpus
+    return path
+
+class TokenCorpus:
+    # Read-only view of a token-id corpus file. Pickles as its path, so worker processes reopen the same
+    # memory map instead of receiving a copy of the data.
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(TOKEN_CORPUS_HEADER.size)
+        if len(header) < TOKEN_CORPUS_HEADER.size:
+            raise ValueError(f"'{path}' is too short to be a token corpus file.")
+        magic, version, itemsize, self.vocab_size, self.num_docs, self.num_tokens, digest = TOKEN_CORPUS_HEADER.unpack(header)
+        if magic != TOKEN_CORPUS_MAGIC or version != TOKEN_CORPUS_VERSION:
+            raise ValueError(f"'{path}' is not a version {TOKEN_CORPUS_VERSION} token corpus file.")
+        self.tokenizer_hash = digest.hex()
+        self.dtype = np.dtype(np.uint16 if itemsize == 2 else np.uint32)
+
+        ids_end = TOKEN_CORPUS_HEADER_SIZE + self.num_tokens * itemsize
+        offsets_start = ids_end + (-ids_end % 8)
+        # np.memmap cannot map zero bytes, so an empty corpus gets an empty in-memory array
+        self.ids = (np.memmap(path, dtype=self.dtype, mode="r", offset=TOKEN_CORPUS_HEADER_SIZE, shape=(self.num_tokens,))
+                    if self.num_tokens else np.empty(0, dtype=self.dtype))
+        self.offsets = np.memmap(path, dtype=np.int64, mode="r", offset=offsets_start, shape=(self.num_docs + 1,))
+
+    def __len__(self):
+        return self.num_docs
+
+    def __getitem__(self, i):
+        if not -self.num_docs <= i < self.num_docs:
+            raise IndexError(f"Document {i} out of range for a corpus of {self.num_docs} documents.")
+        i %= self.num_docs
+        return self.ids[self.offsets[i]:self.offsets[i + 1]]
+
+    def __iter__(self):
+        for i in range(self.num_docs):
+            yield self[i]
+
+    def __reduce__(self):
+        return (TokenCorpus, (self.path,))
+
+    def matches(self, tokenizer):
+        return self.tokenizer_hash == tokenizer_hash(tokenizer)
+
+def export_token_corpora(corpus, texts, output_dir, use_cache=True, batch_size=1024):
+    # Write one token-id corpus per trained tokenizer; `texts` is consumed once per tokenizer, as in run_batch_tokenization_pipeline
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for name in ["BPE", "Unigram", "WordLevel", "WordPiece"]:
+        tokenizer = load_or_train(name, TRAINER_PARAMS[name], corpus, TRAINERS[name], use_cache)
+        paths[name] = write_token_corpus(tokenizer, texts, os.path.join(output_dir, f"{name.lower()}.tokens"), batch_size)
+    return paths
+
 if __name__ == "__main__":
     run_tokenization_pipeline(corpus, text)
 
@@ -0,0 +1,472 @@
+# Local tokenization sidecar for model servers.
+
+# Serves the tokenizers trained by Tokenization-Pipeline.py (and optionally the pretrained BERT tokenizer) over
+# HTTP on a TCP port or a Unix socket. Concurrent requests for the same model are collected into micro-batches
+# within a small time window and encoded with one encode_batch call in a thread pool, off the event loop.
+#
+#   POST /encode  {"model": "BPE", "texts": ["...", ...], "max_length": 128}  -> {"input_ids": [...], "attention_mask": [...]}
+#   GET  /stats   latency histograms, batch sizes and queue depth per model
+#   GET  /health
+#
+# Run `python tokenization_server.py --benchmark` for a load-generator benchmark that runs entirely on localhost
+# and compares micro-batching against one encode call per request.
+
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+
+from tokenizers import Tokenizer
+
+PIPELINE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(PIPELINE_DIR)
+sys.path.insert(0, REPO_DIR)
+
+from tokenization_metrics import metrics
+
+DEFAULT_MODELS = ("BPE", "Unigram", "WordLevel", "WordPiece")
+MAX_BATCH_SIZE = 256
+MAX_WAIT_MS = 2.0
+MAX_LENGTH = 128
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+
+def _load_script(path, module_name):
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@lru_cache(maxsize=None)
+def _pipeline_module():
+    return _load_script(os.path.join(PIPELINE_DIR, "Tokenization-Pipeline.py"), "tokenization_pipeline")
+
+
+class HFTokenizerBackend:
+    """
+    Encoder around a `tokenizers.Tokenizer` from Tokenization-Pipeline.py (served from its artifact cache).
+    """
+    def __init__(self, model_type):
+        pipeline = _pipeline_module()
+        tokenizer = pipeline.load_or_train(model_type, pipeline.TRAINER_PARAMS[model_type], pipeline.corpus,
+                                           pipeline.TRAINERS[model_type])
+        # Private copy: truncation is reconfigured per batch and must not leak into the cached tokenizer
+        self.tokenizer = Tokenizer.from_str(tokenizer.to_str())
+        self.tokenizer.no_padding()
+        self.max_length = None
+
+    def encode_batch(self, texts, max_length):
+        if max_length != self.max_length:
+            self.tokenizer.enable_truncation(max_length=max_length)
+            self.max_length = max_length
+        encodings = self.tokenizer.encode_batch(texts)
+        return [encoding.ids for encoding in encodings], [encoding.attention_mask for encoding in encodings]
+
+
+class BertTokenizerBackend:
+    """
+    Encoder around the pretrained BERT tokenizer loaded by BERT-Tokenizer.py.
+    """
+    def __init__(self, name="bert-base-uncased"):
+        self.tokenizer = _load_script(os.path.join(REPO_DIR, "BERT-Tokenizer.py"), "bert_tokenizer").load_tokenizer(name)
+
+    def encode_batch(self, texts, max_length):
+        encoded = self.tokenizer(texts, truncation=True, max_length=max_length)
+        return encoded["input_ids"], encoded["attention_mask"]
+
+
+def load_backend(model):
+    if model in DEFAULT_MODELS:
+        return HFTokenizerBackend(model)
+    if model == "BERT":
+        return BertTokenizerBackend()
+    raise ValueError(f"Unknown model '{model}'. Choose from {list(DEFAULT_MODELS) + ['BERT']}.")
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (latencies in milliseconds by default) with bucket-resolution percentiles.
+    """
+    def __init__(self, buckets=LATENCY_BUCKETS_MS, unit="ms"):
+        self.buckets = buckets
+        self.unit = unit
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        index = 0
+        while index < len(self.buckets) and value > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q):
+        # Upper bound of the bucket holding the q-th percentile (max observed value for the overflow bucket)
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+        return self.max
+
+    def to_dict(self):
+        labels = [f"<={bound}" for bound in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            "unit": self.unit,
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.max,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class MicroBatcher:
+    """
+    Collects concurrent encode requests for one model and runs them as a single encode_batch call.
+
+    A batch is flushed when it holds `max_batch_size` texts or `max_wait_ms` after its first request arrived,
+    whichever comes first. Requests with different max_length values are batched separately.
+    """
+    def __init__(self, backend, executor, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        self.backend = backend
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.pending_texts = 0
+        self.latency = Histogram()
+        self.queue_wait = Histogram()
+        self.batch_sizes = Histogram(buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024), unit="texts")
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def encode(self, texts, max_length=MAX_LENGTH):
+        future = asyncio.get_running_loop().create_future()
+        self.pending_texts += len(texts)
+        self.queue.put_nowait((texts, max_length, future, time.perf_counter()))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        carry = None
+        while True:
+            first = carry or await self.queue.get()
+            carry = None
+            batch = [first]
+            size = len(first[0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                try:
+                    item = self.queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(self.queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item[1] != first[1]:
+                    carry = item
+                    break
+                batch.append(item)
+                size += len(item[0])
+            await self._flush(batch, size)
+
+    async def _flush(self, batch, size):
+        texts = [text for item in batch for text in item[0]]
+        self.pending_texts -= size
+        start = time.perf_counter()
+        for _, _, _, enqueued in batch:
+            self.queue_wait.observe((start - enqueued) * 1000)
+        self.batch_sizes.observe(size)
+
+        loop = asyncio.get_running_loop()
+        try:
+            input_ids, attention_mask = await loop.run_in_executor(self.executor, self.backend.encode_batch, texts, batch[0][1])
+        except Exception as e:
+            if len(batch) == 1:
+                if not batch[0][2].done():
+                    batch[0][2].set_exception(e)
+                return
+            # Encode each request on its own so one bad request only fails its own client
+            for request_texts, max_length, future, enqueued in batch:
+                try:
+                    result = await loop.run_in_executor(self.executor, self.backend.encode_batch, request_texts, max_length)
+                except Exception as request_error:
+                    if not future.done():
+                        future.set_exception(request_error)
+                    continue
+                if not future.done():
+                    future.set_result(result)
+                self.latency.observe((time.perf_counter() - enqueued) * 1000)
+            return
+
+        end = time.perf_counter()
+        metrics.record(f"server:{type(self.backend).__name__}", sum(map(len, input_ids)), end - start, len(texts))
+        offset = 0
+        for request_texts, _, future, enqueued in batch:
+            count = len(request_texts)
+            if not future.done():
+                future.set_result((input_ids[offset:offset + count], attention_mask[offset:offset + count]))
+            offset += count
+            self.latency.observe((end - enqueued) * 1000)
+
+    def stats(self):
+        return {
+            "queue_depth_requests": self.queue.qsize(),
+            "queue_depth_texts": self.pending_texts,
+            "request_latency": self.latency.to_dict(),
+            "queue_wait": self.queue_wait.to_dict(),
+            "batch_size": self.batch_sizes.to_dict(),
+        }
+
+
+class TokenizationServer:
+    """
+    Minimal HTTP/1.1 server (keep-alive, Content-Length bodies) over asyncio streams.
+    """
+    def __init__(self, models=DEFAULT_MODELS, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS, workers=2):
+        self.models = list(models)
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tokenize")
+        self.batchers = {}
+        self.server = None
+        self.started = None
+
+    async def start(self, host="127.0.0.1", port=8765, unix_socket=None):
+        loop = asyncio.get_running_loop()
+        for model in self.models:
+            # Loading/training happens once, before the first request, and off the event loop
+            backend = await loop.run_in_executor(self.executor, load_backend, model)
+            self.batchers[model] = MicroBatcher(backend, self.executor, self.max_batch_size, self.max_wait_ms)
+            self.batchers[model].start()
+
+        if unix_socket:
+            self.server = await asyncio.start_unix_server(self._handle_connection, path=unix_socket)
+        else:
+            self.server = await asyncio.start_server(self._handle_connection, host, port)
+        self.started = time.time()
+        return self.server
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for batcher in self.batchers.values():
+            await batcher.stop()
+        self.executor.shutdown(wait=False)
+
+    def stats(self):
+        return {
+            "uptime_seconds": time.time() - self.started if self.started else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "models": {model: batcher.stats() for model, batcher in self.batchers.items()},
+        }
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    self._respond(writer, 413, {"error": "Request body too large."})
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self._dispatch(method, path, body)
+                self._respond(writer, status, payload, keep_alive=headers.get("connection", "").lower() != "close")
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, body):
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok", "models": self.models}
+        if method == "GET" and path == "/stats":
+            return 200, self.stats()
+        if method != "POST" or path != "/encode":
+            return 404, {"error": f"No route for {method} {path}."}
+
+        try:
+            request = json.loads(body)
+            if not isinstance(request, dict):
+                raise TypeError("expected a JSON object")
+            texts = request["texts"] if "texts" in request else [request["text"]]
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                raise TypeError("'texts' must be a list of strings")
+            model = request.get("model", self.models[0])
+            max_length = int(request.get("max_length", MAX_LENGTH))
+            if max_length < 1:
+                raise ValueError("'max_length' must be at least 1")
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {"error": f"Invalid request: {e}"}
+        if model not in self.batchers:
+            return 400, {"error": f"Model '{model}' is not loaded. Loaded models: {self.models}."}
+        if not texts:
+            return 200, {"model": model, "input_ids": [], "attention_mask": []}
+
+        try:
+            input_ids, attention_mask = await self.batchers[model].encode(texts, max_length)
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+        return 200, {"model": model, "input_ids": input_ids, "attention_mask": attention_mask}
+
+    @staticmethod
+    def _respond(writer, status, payload, keep_alive=True):
+        body = json.dumps(payload).encode("utf-8")
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large", 500: "Internal Server Error"}[status]
+        head = (f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+
+
+# Load generator: persistent localhost connections, each sending requests back to back
+
+async def _open_connection(host, port, unix_socket):
+    if unix_socket:
+        return await asyncio.open_unix_connection(unix_socket)
+    return await asyncio.open_connection(host, port)
+
+
+async def _client(host, port, unix_socket, model, texts, requests, latencies):
+    reader, writer = await _open_connection(host, port, unix_socket)
+    try:
+        for i in range(requests):
+            body = json.dumps({"model": model, "texts": [texts[i % len(texts)]]}).encode("utf-8")
+            start = time.perf_counter()
+            writer.write(f"POST /encode HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+            await writer.drain()
+            await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        writer.close()
+
+
+async def run_load(host="127.0.0.1", port=8765, unix_socket=None, model="BPE", texts=None, concurrency=64, requests=2000):
+    """
+    Send `requests` single-text encode requests from `concurrency` concurrent clients and report
+    client-side throughput and latency percentiles.
+    """
+    texts = texts or _pipeline_module().corpus
+    per_client = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, unix_socket, model, texts, n, latencies) for n in per_client if n))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "requests_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": latencies[len(latencies) // 2] if latencies else 0.0,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0,
+    }
+
+
+async def run_benchmark(model="BPE", concurrency=64, requests=2000, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS,
+                        workers=2, use_unix_socket=False):
+    """
+    Start the server in-process on localhost and load it twice: without batching (one encode per request)
+    and with micro-batching.
+    """
+    results = {}
+    configs = {"unbatched": (1, 0.0), "micro_batched": (max_batch_size, max_wait_ms)}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (batch_size, wait_ms) in configs.items():
+            server = TokenizationServer([model], batch_size, wait_ms, workers)
+            unix_socket = os.path.join(tmp, f"{name}.sock") if use_unix_socket else None
+            await server.start(port=0, unix_socket=unix_socket)
+            port = None if unix_socket else server.server.sockets[0].getsockname()[1]
+            try:
+                load = await run_load(port=port, unix_socket=unix_socket, model=model, concurrency=concurrency, requests=requests)
+            finally:
+                stats = server.stats()["models"][model]
+                await server.stop()
+            results[name] = {"load": load, "server": stats}
+            print(f"{name}: {load['requests_per_sec']:.0f} req/s, p50 {load['p50_ms']:.2f} ms, p99 {load['p99_ms']:.2f} ms, "
+                  f"mean batch {stats['batch_size']['mean']:.1f} texts")
+    return results
+
+
+async def serve(args):
+    server = TokenizationServer(args.models, args.max_batch_size, args.max_wait_ms, args.workers)
+    await server.start(args.host, args.port, args.unix_socket)
+    print(f"Serving {args.models} on {args.unix_socket or f'http://{args.host}:{args.port}'}")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local micro-batching tokenization server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--models", nargs="+", default=list(DEFAULT_MODELS), choices=list(DEFAULT_MODELS) + ["BERT"])
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE, help="Maximum texts per encode_batch call")
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS, help="Batching window after the first request")
+    parser.add_argument("--workers", type=int, default=2, help="Encoder threads")
+    parser.add_argument("--benchmark", action="store_true", help="Run the localhost load-generator benchmark and exit")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent benchmark clients")
+    parser.add_argument("--requests", type=int, default=2000, help="Total benchmark requests")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        report = asyncio.run(run_benchmark(args.models[0], args.concurrency, args.requests, args.max_batch_size,
+                                           args.max_wait_ms, args.workers, args.unix_socket is not None))
+        print(json.dumps(report, indent=2))
+    else:
+        asyncio.run(serve(args))
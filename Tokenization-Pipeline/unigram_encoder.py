@@ -0,0 +1,501 @@
+# Dependency-light Unigram encoder for tokenizer JSON files such as unigram_tokenizer.json.
+
+# Loads the Unigram vocab (pieces and log-probabilities) into a double-array trie and picks the highest-probability
+# segmentation of every word with Viterbi, as described in Working.md. Only NumPy and the standard library are needed,
+# so it can run on workers without `tokenizers`; on the same JSON it produces the same ids as `tokenizers`.
+#
+# Besides the best segmentation it can return the n best segmentations of a word and sample segmentations
+# (subword regularization). Run this file to check parity with `tokenizers` and benchmark both.
+
+from array import array
+from functools import lru_cache
+import json
+import math
+import random
+import re
+import sys
+import unicodedata
+
+import numpy as np
+
+# Same penalty `tokenizers` and SentencePiece give unknown characters relative to the rarest piece
+UNK_PENALTY = 10.0
+WORD_CACHE_SIZE = 10000
+
+# `tokenizers` splits with Rust's regex classes, which differ from Python's: Rust's `\w` is Alphabetic, marks, Nd, Pc
+# and Join_Control (Python's misses marks such as Devanagari vowel signs), and Rust's `\s` is White_Space (Python's
+# also includes \x1c-\x1f). Alphabetic is letters, Nl and a few Other_Alphabetic symbols listed below.
+WORD_CATEGORIES = ("L", "M", "Nd", "Nl", "Pc")
+EXTRA_WORD_RANGES = ((0x200C, 0x200D), (0x24B6, 0x24E9), (0x1F130, 0x1F149), (0x1F150, 0x1F169), (0x1F170, 0x1F189))
+NON_SPACE_SEPARATORS = range(0x1C, 0x20)
+
+# Always part of the parity check in benchmark(): scripts with combining marks, joiners and non-Latin digits
+PARITY_TEXTS = [
+    "नमस्ते दुनिया",
+    "Café naïve façade – São Paulo, 東京タワー!",
+    "Ⓐ ZW\u200cNJ und ZW\u200dJ, ٣٤٥ ١٢ — x\x1cy",
+]
+
+PRE_TOKENIZER_PATTERNS = {
+    "Whitespace": r"{word}+|[^{word_chars}{space_chars}]+",
+    "WhitespaceSplit": r"[^{space_chars}]+",
+}
+
+
+def _char_class(code_points):
+    # Regex class body for a sorted list of code points, with consecutive runs written as ranges
+    runs = []
+    for code_point in code_points:
+        if runs and runs[-1][1] == code_point - 1:
+            runs[-1][1] = code_point
+        else:
+            runs.append([code_point, code_point])
+    return "".join(re.escape(chr(first)) if first == last else f"{re.escape(chr(first))}-{re.escape(chr(last))}"
+                   for first, last in runs)
+
+
+@lru_cache(maxsize=1)
+def _rust_char_classes():
+    # (word, space) class bodies, built from unicodedata in one pass over all code points
+    word, space = [], []
+    extra = {code_point for first, last in EXTRA_WORD_RANGES for code_point in range(first, last + 1)}
+    for code_point in range(sys.maxunicode + 1):
+        char = chr(code_point)
+        if code_point in extra or unicodedata.category(char).startswith(WORD_CATEGORIES):
+            word.append(code_point)
+        elif char.isspace() and code_point not in NON_SPACE_SEPARATORS:
+            space.append(code_point)
+    return _char_class(word), _char_class(space)
+
+
+@lru_cache(maxsize=None)
+def pre_tokenizer_pattern(name):
+    """
+    Compile the `tokenizers` pre-tokenizer `name` with Rust-equivalent word and space classes (built on first use).
+    """
+    word_chars, space_chars = _rust_char_classes()
+    return re.compile(PRE_TOKENIZER_PATTERNS[name].format(word=f"[{word_chars}]", word_chars=word_chars, space_chars=space_chars))
+
+
+class DoubleArrayTrie:
+    """
+    Array-backed trie over the vocab pieces. A transition from state `s` on character code `c` goes to
+    `t = base[s] + c` and is valid when `check[t] == s`; `value[t]` is the piece id ending at `t` or -1.
+    """
+    def __init__(self, pieces):
+        # Character codes start at 1; the most frequent characters get the smallest codes
+        char_counts = {}
+        for piece in pieces:
+            for char in piece:
+                char_counts[char] = char_counts.get(char, 0) + 1
+        self.codes = {char: code for code, char in enumerate(sorted(char_counts, key=lambda c: (-char_counts[c], c)), 1)}
+
+        # Temporary pointer trie, only used while laying out the arrays
+        children = [{}]
+        terminal = [-1]
+        for piece_id, piece in enumerate(pieces):
+            node = 0
+            for char in piece:
+                code = self.codes[char]
+                if code not in children[node]:
+                    children[node][code] = len(children)
+                    children.append({})
+                    terminal.append(-1)
+                node = children[node][code]
+            if terminal[node] < 0:
+                terminal[node] = piece_id
+
+        base, check, value = [0], [0], [terminal[0]]
+        position = {0: 0}
+        queue = [0]
+        first_free = 1
+        for node in queue:
+            codes = sorted(children[node])
+            if not codes:
+                continue
+            while first_free < len(check) and check[first_free] >= 0:
+                first_free += 1
+            # Smallest base that places every child on a free slot
+            b = max(1, first_free - codes[0])
+            while any(b + code < len(check) and check[b + code] >= 0 for code in codes):
+                b += 1
+            needed = b + codes[-1] + 1
+            if needed > len(check):
+                grow = needed - len(check)
+                base.extend([0] * grow)
+                check.extend([-1] * grow)
+                value.extend([-1] * grow)
+            state = position[node]
+            base[state] = b
+            for code in codes:
+                child = children[node][code]
+                check[b + code] = state
+                value[b + code] = terminal[child]
+                position[child] = b + code
+                queue.append(child)
+
+        # Compact int32 storage; array.array (unlike NumPy) indexes about as fast as a list in the per-character loop
+        self.base = array("i", base)
+        self.check = array("i", check)
+        self.value = array("i", value)
+
+    def common_prefixes(self, word, start):
+        """
+        Yield (end, piece_id) for every vocab piece that is a prefix of word[start:], shortest first.
+        """
+        codes, base, check, value = self.codes, self.base, self.check, self.value
+        size = len(check)
+        state = 0
+        for end in range(start, len(word)):
+            code = codes.get(word[end])
+            if code is None:
+                return
+            target = base[state] + code
+            if target >= size or check[target] != state:
+                return
+            state = target
+            if value[target] >= 0:
+                yield end + 1, value[target]
+
+    def nbytes(self):
+        """
+        Memory held by the trie: the three int32 arrays and the character code map.
+        """
+        arrays = sum(values.buffer_info()[1] * values.itemsize for values in (self.base, self.check, self.value))
+        return arrays + sys.getsizeof(self.codes) + sum(sys.getsizeof(char) for char in self.codes)
+
+
+def _list_nbytes(values):
+    # The list itself plus every distinct object it references (shared small ints are counted once)
+    return sys.getsizeof(values) + sum({id(item): sys.getsizeof(item) for item in values}.values())
+
+
+class UnigramEncoder:
+    """
+    Viterbi Unigram encoder built from a `tokenizers` JSON file (model type "Unigram").
+    """
+    def __init__(self, config):
+        model = config["model"]
+        if model.get("type") != "Unigram":
+            raise ValueError(f"Expected a Unigram model, got '{model.get('type')}'.")
+        if config.get("normalizer") is not None:
+            raise ValueError(f"Normalizer '{config['normalizer'].get('type')}' is not supported.")
+        pre_tokenizer = (config.get("pre_tokenizer") or {}).get("type")
+        if pre_tokenizer is not None and pre_tokenizer not in PRE_TOKENIZER_PATTERNS:
+            raise ValueError(f"Pre-tokenizer '{pre_tokenizer}' is not supported. Choose from {sorted(PRE_TOKENIZER_PATTERNS)}.")
+
+        self.pieces = [piece for piece, _ in model["vocab"]]
+        self.scores = [float(score) for _, score in model["vocab"]]
+        self.piece_to_id = {piece: piece_id for piece_id, piece in enumerate(self.pieces)}
+        self.unk_id = model.get("unk_id")
+        self.unk_score = min(self.scores) - UNK_PENALTY
+        self.trie = DoubleArrayTrie(self.pieces)
+        self.pre_tokenizer = pre_tokenizer_pattern(pre_tokenizer) if pre_tokenizer is not None else None
+
+        # Added (special) tokens are matched verbatim before pre-tokenization, longest first
+        self.added_tokens = {token["content"]: token["id"] for token in config.get("added_tokens", [])}
+        self.added_pattern = None
+        if self.added_tokens:
+            alternatives = sorted(self.added_tokens, key=len, reverse=True)
+            self.added_pattern = re.compile("|".join(re.escape(token) for token in alternatives))
+
+        # Viterbi buffers, preallocated and grown to the longest word seen
+        self._capacity = 0
+        self._grow(64)
+        self._cache = {}
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def from_str(cls, json_str):
+        return cls(json.loads(json_str))
+
+    def _grow(self, length):
+        capacity = max(length + 1, 2 * self._capacity)
+        self._best = [0.0] * capacity
+        self._back_start = [0] * capacity
+        self._back_id = [0] * capacity
+        self._capacity = capacity
+
+    def nbytes(self):
+        """
+        Memory held by the trie and the Viterbi buffers (the word cache is not included).
+        """
+        return self.trie.nbytes() + _list_nbytes(self._best) + _list_nbytes(self._back_start) + _list_nbytes(self._back_id)
+
+    def _unk(self, piece):
+        if self.unk_id is None:
+            raise ValueError(f"Encountered an unknown token ({piece!r}) but `unk_id` is missing.")
+        return self.unk_id
+
+    def encode_word(self, word):
+        """
+        Best segmentation of one pre-tokenized word as (pieces, ids). Runs of unknown characters are fused
+        into one unknown piece.
+        """
+        cached = self._cache.get(word)
+        if cached is not None:
+            return cached
+
+        n = len(word)
+        if n + 1 > self._capacity:
+            self._grow(n)
+        best, back_start, back_id = self._best, self._back_start, self._back_id
+        scores, unk_score = self.scores, self.unk_score
+        for i in range(1, n + 1):
+            best[i] = -math.inf
+        best[0] = 0.0
+
+        for start in range(n):
+            start_score = best[start]
+            has_single = False
+            for end, piece_id in self.trie.common_prefixes(word, start):
+                score = start_score + scores[piece_id]
+                if score > best[end]:
+                    best[end], back_start[end], back_id[end] = score, start, piece_id
+                if end == start + 1:
+                    has_single = True
+            if not has_single:
+                score = start_score + unk_score
+                if score > best[start + 1]:
+                    best[start + 1], back_start[start + 1], back_id[start + 1] = score, start, -1
+
+        segments = []
+        end = n
+        while end > 0:
+            start = back_start[end]
+            if back_id[end] < 0 and segments and segments[-1][2] < 0 and segments[-1][0] == end:
+                segments[-1] = (start, segments[-1][1], -1)
+            else:
+                segments.append((start, end, back_id[end]))
+            end = start
+        segments.reverse()
+
+        pieces = [word[start:end] for start, end, _ in segments]
+        ids = [piece_id if piece_id >= 0 else self._unk(piece) for (_, _, piece_id), piece in zip(segments, pieces)]
+        result = (pieces, ids)
+        # Like `tokenizers`, stop caching once the cache is full instead of evicting
+        if len(self._cache) < WORD_CACHE_SIZE:
+            self._cache[word] = result
+        return result
+
+    def _words(self, text):
+        """
+        Split `text` into added tokens (yielded with their id) and pre-tokenized words (id None).
+        """
+        position = 0
+        matches = self.added_pattern.finditer(text) if self.added_pattern else ()
+        for match in matches:
+            for word in self._pre_tokenize(text[position:match.start()]):
+                yield word, None
+            yield match.group(), self.added_tokens[match.group()]
+            position = match.end()
+        for word in self._pre_tokenize(text[position:]):
+            yield word, None
+
+    def _pre_tokenize(self, text):
+        if self.pre_tokenizer is None:
+            return [text] if text else []
+        return self.pre_tokenizer.findall(text)
+
+    def tokenize(self, text):
+        pieces = []
+        for word, added_id in self._words(text):
+            pieces.extend([word] if added_id is not None else self.encode_word(word)[0])
+        return pieces
+
+    def encode(self, text):
+        ids = []
+        for word, added_id in self._words(text):
+            if added_id is not None:
+                ids.append(added_id)
+            else:
+                ids.extend(self.encode_word(word)[1])
+        return ids
+
+    def encode_batch(self, texts):
+        """
+        Encode many texts into CSR form: a contiguous int32 `ids` array and int64 `offsets` (len(texts) + 1)
+        so that text i has ids[offsets[i]:offsets[i + 1]].
+        """
+        ids = []
+        offsets = [0]
+        for text in texts:
+            ids.extend(self.encode(text))
+            offsets.append(len(ids))
+        return np.array(ids, dtype=np.int32), np.array(offsets, dtype=np.int64)
+
+    def _lattice(self, word):
+        # Edges ending at each position as (start, piece_id, score); piece_id -1 is an unknown character
+        ends = [[] for _ in range(len(word) + 1)]
+        for start in range(len(word)):
+            has_single = False
+            for end, piece_id in self.trie.common_prefixes(word, start):
+                ends[end].append((start, piece_id, self.scores[piece_id]))
+                has_single = has_single or end == start + 1
+            if not has_single:
+                ends[start + 1].append((start, -1, self.unk_score))
+        return ends
+
+    def _segments_to_pieces(self, word, segments):
+        pieces = [word[start:end] for start, end, _ in segments]
+        ids = [piece_id if piece_id >= 0 else self._unk(piece) for (_, _, piece_id), piece in zip(segments, pieces)]
+        return pieces, ids
+
+    def nbest_word(self, word, n=5):
+        """
+        The `n` highest-scoring segmentations of one word as [(score, pieces, ids), ...], best first.
+        """
+        ends = self._lattice(word)
+        # kbest[pos] holds up to n (score, start, piece_id, rank at start) entries for prefixes ending at pos
+        kbest = [[(0.0, -1, -1, -1)]] + [None] * len(word)
+        for end in range(1, len(word) + 1):
+            candidates = [(kbest[start][rank][0] + score, start, piece_id, rank)
+                          for start, piece_id, score in ends[end]
+                          for rank in range(len(kbest[start]))]
+            candidates.sort(key=lambda candidate: -candidate[0])
+            kbest[end] = candidates[:n]
+
+        results = []
+        for score, start, piece_id, rank in kbest[len(word)]:
+            segments = []
+            end = len(word)
+            while end > 0:
+                segments.append((start, end, piece_id))
+                end = start
+                _, start, piece_id, rank = kbest[end][rank] if end > 0 else (0.0, -1, -1, -1)
+            segments.reverse()
+            results.append((score, *self._segments_to_pieces(word, segments)))
+        return results
+
+    def sample_word(self, word, alpha=0.1, rng=random):
+        """
+        Sample one segmentation with probability proportional to exp(alpha * score) (subword regularization).
+        Smaller `alpha` gives more varied segmentations; large values approach the Viterbi result.
+        """
+        ends = self._lattice(word)
+        forward = [0.0] + [-math.inf] * len(word)
+        for end in range(1, len(word) + 1):
+            terms = [forward[start] + alpha * score for start, _, score in ends[end]]
+            top = max(terms)
+            forward[end] = top + math.log(sum(math.exp(term - top) for term in terms))
+
+        segments = []
+        end = len(word)
+        while end > 0:
+            weights = [math.exp(forward[start] + alpha * score - forward[end]) for start, _, score in ends[end]]
+            start, piece_id, _ = rng.choices(ends[end], weights=weights)[0]
+            segments.append((start, end, piece_id))
+            end = start
+        segments.reverse()
+        return self._segments_to_pieces(word, segments)
+
+    def sample(self, text, alpha=0.1, seed=None):
+        """
+        Encode `text` with a sampled segmentation of every word; returns (pieces, ids).
+        """
+        rng = random.Random(seed)
+        pieces, ids = [], []
+        for word, added_id in self._words(text):
+            if added_id is not None:
+                word_pieces, word_ids = [word], [added_id]
+            else:
+                word_pieces, word_ids = self.sample_word(word, alpha, rng)
+            pieces.extend(word_pieces)
+            ids.extend(word_ids)
+        return pieces, ids
+
+
+def benchmark(tokenizer_file, texts, repeats=5):
+    """
+    Check that UnigramEncoder matches `tokenizers` on `texts`, then compare per-text and batch throughput.
+    """
+    import time
+    from tokenizers import Tokenizer
+
+    reference = Tokenizer.from_file(tokenizer_file)
+    encoder = UnigramEncoder.from_file(tokenizer_file)
+
+    def outcome(encode, text):
+        # Without an unk_id both encoders must reject unknown characters, so a failure on both sides is a match
+        try:
+            return encode(text)
+        except Exception:
+            return None
+
+    parity_texts = list(texts) + PARITY_TEXTS
+    mismatches = [text for text in parity_texts
+                  if outcome(encoder.encode, text) != outcome(lambda t: reference.encode(t).ids, text)]
+    if reference.pre_tokenizer is not None:
+        mismatches += [text for text in parity_texts
+                       if encoder._pre_tokenize(text) != [word for word, _ in reference.pre_tokenizer.pre_tokenize_str(text)]]
+    ids, offsets = encoder.encode_batch(texts)
+    reference_ids = [encoding.ids for encoding in reference.encode_batch(texts)]
+    batch_matches = all(ids[offsets[i]:offsets[i + 1]].tolist() == reference_ids[i] for i in range(len(texts)))
+
+    def timed(fn):
+        best = math.inf
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return len(texts) / best
+
+    # The word cache makes repeated runs much faster; clear it to time a cold encoder as well
+    def cold_encode():
+        encoder._cache.clear()
+        for text in texts:
+            encoder.encode(text)
+
+    results = {
+        "texts": len(texts),
+        "parity_texts": len(parity_texts),
+        "mismatches": len(mismatches),
+        "batch_matches": batch_matches,
+        "trie_bytes": encoder.trie.nbytes(),
+        "encoder_bytes": encoder.nbytes(),
+        "docs_per_sec": {
+            "unigram_encoder.encode (cold cache)": timed(cold_encode),
+            "unigram_encoder.encode": timed(lambda: [encoder.encode(text) for text in texts]),
+            "unigram_encoder.encode_batch": timed(lambda: encoder.encode_batch(texts)),
+            "tokenizers.encode": timed(lambda: [reference.encode(text) for text in texts]),
+            "tokenizers.encode_batch": timed(lambda: reference.encode_batch(texts)),
+        },
+    }
+    return results, mismatches[:5]
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Benchmark the NumPy Unigram encoder against tokenizers.")
+    parser.add_argument("--tokenizer-file", default=os.path.join(here, "unigram_tokenizer.json"))
+    parser.add_argument("--corpus-file", help="Text file, one document per line (defaults to the pipeline corpus)")
+    parser.add_argument("--docs", type=int, default=5000, help="Number of documents to encode")
+    args = parser.parse_args()
+
+    if args.corpus_file:
+        with open(args.corpus_file, "r", encoding="utf-8") as f:
+            lines = [line.strip() for line in f if line.strip()]
+    else:
+        import importlib.util
+        spec = importlib.util.spec_from_file_location("tokenization_pipeline", os.path.join(here, "Tokenization-Pipeline.py"))
+        pipeline = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(pipeline)
+        lines = pipeline.corpus + [pipeline.text]
+    texts = [lines[i % len(lines)] for i in range(args.docs)]
+
+    encoder = UnigramEncoder.from_file(args.tokenizer_file)
+    print("Viterbi:", encoder.tokenize(texts[0]))
+    print("3-best 'Nissan':", [(round(score, 3), pieces) for score, pieces, _ in encoder.nbest_word("Nissan", 3)])
+    print("Sampled:", encoder.sample(texts[0], alpha=0.1, seed=0)[0])
+
+    results, mismatches = benchmark(args.tokenizer_file, texts)
+    print(json.dumps(results, indent=2))
+    for text in mismatches:
+        print("Mismatch:", text)
@@ -0,0 +1,428 @@
+# Reproducible benchmark for every tokenizer in this repository.
+
+# Runs each backend over a synthetic corpus and (optionally) a file-based corpus at several sizes and reports
+# tokens/sec, docs/sec, p50/p99 latency per doc, peak RSS and import/load time as JSON.
+# Load time and RSS are measured in a fresh process per backend and corpus, so native allocations (Rust tokenizers,
+# spaCy, Stanza) are included, imports are not shared between backends and one backend's memory does not carry over
+# into the next. Memory is reported as the growth from just before loading to the peak.
+# With --cold-start it instead measures the import time of every entry point in a fresh interpreter.
+# Backends whose packages or models are not installed are skipped and listed with the reason; backends that
+# load but fail on the documents (errors or no tokens at all) are listed under "errors".
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+
+from tokenization_metrics import metrics
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SYNTHETIC_WORDS = [
+    "the", "Nissan", "GT-R", "is", "known", "for", "its", "powerful", "twin-turbo", "engine", "and", "advanced",
+    "Japanese", "sports", "cars", "like", "Toyota", "Supra", "have", "a", "cult", "following", "around", "world",
+    "don't", "it's", "Godzilla", "acceleration", "handling", "reliability", "performance", "technology", "#cars",
+    "@someone", "😊", "http://example.com", "3.14", "2019", "U.S.", "e-mail",
+]
+SYNTHETIC_PUNCTUATION = [",", ".", "!", "?", ";", ":", "'", '"']
+
+
+def load_script(relative_path, module_name):
+    """
+    Import one of the repository scripts by file path (several have spaces or hyphens in their names).
+    """
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(REPO_DIR, relative_path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def synthetic_corpus(size, seed=0):
+    """
+    Generate `size` reproducible pseudo-sentences mixing words, punctuation, hashtags, mentions, URLs and emoji.
+    """
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(size):
+        words = []
+        for _ in range(rng.randint(5, 60)):
+            words.append(rng.choice(SYNTHETIC_WORDS))
+            if rng.random() < 0.15:
+                words[-1] += rng.choice(SYNTHETIC_PUNCTUATION)
+        docs.append(" ".join(words))
+    return docs
+
+
+def file_corpus(path, size):
+    """
+    Read the first `size` non-empty lines of `path`, cycling the file if it is shorter.
+    """
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    if not lines:
+        raise ValueError(f"Corpus file '{path}' has no non-empty lines.")
+    return [lines[i % len(lines)] for i in range(size)]
+
+
+# Backend loaders: each returns a callable mapping one document to a list of tokens.
+# Loaders import lazily so a missing package only skips that backend.
+
+def _additional_methods(name):
+    def loader():
+        module = load_script(os.path.join("NLP Enhancements", "tokenization", "additional_methods.py"), "additional_methods")
+        return getattr(module, name)
+    return loader
+
+
+def _gensim_custom_tokenize():
+    module = load_script("Gensim.py", "Gensim")
+    # Cap token length at 15 like gensim's simple_preprocess (custom_tokenize keeps every length by default)
+    return lambda text: module.custom_tokenize(text, max_len=15)
+
+
+def _nltk_tokenizer(class_name, *args):
+    def loader():
+        import nltk.tokenize
+        return getattr(nltk.tokenize, class_name)(*args).tokenize
+    return loader
+
+
+def _spacy():
+    import spacy
+    nlp = spacy.load("en_core_web_sm")
+    return lambda text: [token.text for token in nlp(text)]
+
+
+def _stanza():
+    import stanza
+    nlp = stanza.Pipeline(lang="en", processors="tokenize", download_method=None, verbose=False)
+    return lambda text: [word.text for sentence in nlp(text).sentences for word in sentence.words]
+
+
+def _bert():
+    from transformers import BertTokenizer
+    tokenizer = BertTokenizer.from_pretrained("bert-base-uncased", local_files_only=True)
+    return tokenizer.tokenize
+
+
+def _hf_pipeline(model_type):
+    def loader():
+        module = load_script(os.path.join("Tokenization-Pipeline", "Tokenization-Pipeline.py"), "tokenization_pipeline")
+        tokenizer = module.load_or_train(model_type, module.TRAINER_PARAMS[model_type], module.corpus, module.TRAINERS[model_type])
+        return lambda text: tokenizer.encode(text).tokens
+    return loader
+
+
+BACKENDS = {
+    "additional_methods.nltk_word_tokenize": _additional_methods("nltk_word_tokenize"),
+    "additional_methods.treebank_word_tokenize": _additional_methods("treebank_word_tokenize"),
+    "additional_methods.regex_word_tokenize": _additional_methods("regex_word_tokenize"),
+    "Gensim.custom_tokenize": _gensim_custom_tokenize,
+    "nltk.TreebankWordTokenizer": _nltk_tokenizer("TreebankWordTokenizer"),
+    "nltk.WordPunctTokenizer": _nltk_tokenizer("WordPunctTokenizer"),
+    "nltk.RegexpTokenizer": _nltk_tokenizer("RegexpTokenizer", r"\w+"),
+    "nltk.TweetTokenizer": _nltk_tokenizer("TweetTokenizer"),
+    "nltk.WhitespaceTokenizer": _nltk_tokenizer("WhitespaceTokenizer"),
+    "spacy.en_core_web_sm": _spacy,
+    "stanza.en": _stanza,
+    "transformers.BertTokenizer": _bert,
+    "tokenizers.BPE": _hf_pipeline("BPE"),
+    "tokenizers.Unigram": _hf_pipeline("Unigram"),
+    "tokenizers.WordLevel": _hf_pipeline("WordLevel"),
+    "tokenizers.WordPiece": _hf_pipeline("WordPiece"),
+}
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def build_corpora(sizes, corpus_file=None, seed=0):
+    corpora = {f"synthetic-{size}": synthetic_corpus(size, seed) for size in sizes}
+    if corpus_file:
+        corpora.update({f"file-{size}": file_corpus(corpus_file, size) for size in sizes})
+    return corpora
+
+
+class RssMonitor:
+    """
+    Current and peak RSS of this process, with the peak counted from when the monitor was started.
+
+    On Linux the kernel's high-water mark is reset through /proc/self/clear_refs and read back as VmHWM.
+    Elsewhere psutil's RSS is sampled from a background thread, so very short spikes can be missed.
+    Without either, every reading is None.
+    """
+    SAMPLE_INTERVAL = 0.005
+
+    def __init__(self):
+        self._process = None
+        self._peak = 0
+        self._stop = threading.Event()
+        try:
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+            self.method = "VmHWM"
+            return
+        except OSError:
+            pass
+        try:
+            import psutil
+        except ImportError:
+            self.method = None
+            return
+        self.method = "psutil"
+        self._process = psutil.Process()
+        self._peak = self._process.memory_info().rss
+        threading.Thread(target=self._sample, daemon=True).start()
+
+    def _sample(self):
+        while not self._stop.wait(self.SAMPLE_INTERVAL):
+            self._peak = max(self._peak, self._process.memory_info().rss)
+
+    @staticmethod
+    def _proc_status_mb(field):
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024  # kB
+        return None
+
+    def current_mb(self):
+        if self.method == "VmHWM":
+            return self._proc_status_mb("VmRSS")
+        if self.method == "psutil":
+            rss = self._process.memory_info().rss
+            self._peak = max(self._peak, rss)
+            return rss / (1024 * 1024)
+        return None
+
+    def peak_mb(self):
+        if self.method == "VmHWM":
+            return self._proc_status_mb("VmHWM")
+        if self.method == "psutil":
+            self.current_mb()
+            return self._peak / (1024 * 1024)
+        return None
+
+    def stop(self):
+        self._stop.set()
+
+
+def rss_probe(name, corpus_name, corpus_file=None, seed=0):
+    """
+    Runs in a fresh child process: load one backend, tokenize one corpus and report the load time, the RSS
+    before and after loading, the peak RSS and the growth from just before loading to the peak.
+    """
+    kind, size = corpus_name.rsplit("-", 1)
+    docs = build_corpora([int(size)], corpus_file if kind == "file" else None, seed)[corpus_name]
+    monitor = RssMonitor()
+    before = monitor.current_mb()
+    load_start = time.perf_counter()
+    tokenize = BACKENDS[name]()
+    load_seconds = time.perf_counter() - load_start
+    loaded = monitor.current_mb()
+    for doc in docs:
+        tokenize(doc)
+    peak = monitor.peak_mb()
+    monitor.stop()
+    return {
+        "load_seconds": load_seconds,
+        "rss_method": monitor.method,
+        "rss_before_load_mb": before,
+        "rss_after_load_mb": loaded,
+        "peak_rss_mb": peak,
+        "load_to_peak_rss_mb": peak - before if peak is not None else None,
+    }
+
+
+def measure_rss(name, corpus_name, corpus_file=None, seed=0):
+    command = [sys.executable, os.path.abspath(__file__), "--rss-probe", name, "--probe-corpus", corpus_name, "--seed", str(seed)]
+    if corpus_file:
+        command += ["--corpus-file", corpus_file]
+    proc = subprocess.run(command, capture_output=True, text=True, cwd=REPO_DIR)
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        return {"rss_error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit code {proc.returncode}"}
+    # Backends may print while loading; the probe result is the last line
+    return json.loads(lines[-1])
+
+
+def measure(tokenize, docs):
+    """
+    Time `tokenize` over `docs` and count the documents that failed (raised, or were recorded as errors
+    by the instrumented tokenizers in tokenization_metrics).
+    """
+    errors_before = sum(stats["errors"] for stats in metrics.snapshot().values())
+    failed = 0
+    latencies = []
+    total_tokens = 0
+    start = time.perf_counter()
+    for doc in docs:
+        doc_start = time.perf_counter()
+        try:
+            tokens = tokenize(doc)
+        except Exception:
+            failed += 1
+            tokens = []
+        latencies.append(time.perf_counter() - doc_start)
+        total_tokens += len(tokens)
+    elapsed = time.perf_counter() - start
+    failed += sum(stats["errors"] for stats in metrics.snapshot().values()) - errors_before
+
+    latencies.sort()
+    return {
+        "docs": len(docs),
+        "tokens": total_tokens,
+        "seconds": elapsed,
+        "docs_per_sec": len(docs) / elapsed if elapsed else 0.0,
+        "tokens_per_sec": total_tokens / elapsed if elapsed else 0.0,
+        "p50_latency_ms": percentile(latencies, 50) * 1000,
+        "p99_latency_ms": percentile(latencies, 99) * 1000,
+        "failed_docs": failed,
+    }
+
+
+def run_benchmark(sizes=(100, 1000, 10000), corpus_file=None, backends=None, seed=0):
+    corpora = build_corpora(sizes, corpus_file, seed)
+
+    results = {
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed": seed,
+            "sizes": list(sizes),
+            "corpus_file": corpus_file,
+        },
+        "backends": {},
+        "skipped": {},
+        "errors": {},
+    }
+
+    for name in backends or BACKENDS:
+        try:
+            tokenize = BACKENDS[name]()
+        except (ImportError, OSError, LookupError, ValueError) as e:
+            results["skipped"][name] = f"{type(e).__name__}: {e}"
+            print(f"Skipping {name}: {type(e).__name__}: {e}")
+            continue
+
+        runs = {corpus_name: measure(tokenize, docs) for corpus_name, docs in corpora.items()}
+        failed = sum(run["failed_docs"] for run in runs.values())
+        if failed or not any(run["tokens"] for run in runs.values()):
+            reason = f"{failed} of {sum(run['docs'] for run in runs.values())} documents failed" if failed else "produced no tokens"
+            results["errors"][name] = reason
+            print(f"Not reporting {name}: {reason} (see the log for the underlying error)")
+            continue
+
+        # Load time and memory come from the fresh child processes; this process has already imported
+        # whatever earlier backends pulled in
+        for corpus_name, run in runs.items():
+            probe = measure_rss(name, corpus_name, corpus_file, seed)
+            run.update({key: value for key, value in probe.items() if key != "load_seconds"})
+            run["probe_load_seconds"] = probe.get("load_seconds")
+        load_times = [run["probe_load_seconds"] for run in runs.values() if run["probe_load_seconds"] is not None]
+        load_seconds = min(load_times) if load_times else None
+        results["backends"][name] = {"load_seconds": load_seconds, "runs": runs}
+
+        largest = runs[max(runs, key=lambda k: runs[k]["docs"])]
+        delta = largest.get("load_to_peak_rss_mb")
+        print(f"{name}: load {f'{load_seconds:.3f}s' if load_seconds is not None else 'n/a'}, "
+              f"{largest['tokens_per_sec']:.0f} tokens/sec, p99 {largest['p99_latency_ms']:.3f} ms, "
+              f"RSS +{f'{delta:.1f} MB' if delta is not None else 'n/a'} from load to peak")
+
+    return results
+
+
+# Entry points whose cold-start (import) time is measured in a fresh interpreter each
+ENTRY_POINTS = [
+    "Gensim.py",
+    "Natural_Language_Toolkit.py",
+    "spaCy.py",
+    "Stanford_NLP.py",
+    "BERT-Tokenizer.py",
+    "Hugging_Face's_Transformers.py",
+    "SentencePiece.py",
+    os.path.join("Tokenization-Pipeline", "Tokenization-Pipeline.py"),
+    os.path.join("NLP Enhancements", "tokenization", "additional_methods.py"),
+    os.path.join("NLP Enhancements", "data_handling", "data_preprocessing.py"),
+]
+
+COLD_START_CODE = """
+import importlib.util, sys, time
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location("entry_point", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+print(time.perf_counter() - start)
+"""
+
+
+def measure_cold_start(entry_points=None, repeats=3, top=5):
+    """
+    Import each entry point in a fresh `python -X importtime` process and report the median import time
+    plus the modules with the largest cumulative import cost.
+    """
+    results = {}
+    for entry_point in entry_points or ENTRY_POINTS:
+        path = os.path.join(REPO_DIR, entry_point)
+        timings, slowest, error = [], [], None
+        for _ in range(repeats):
+            proc = subprocess.run([sys.executable, "-X", "importtime", "-c", COLD_START_CODE, path],
+                                  capture_output=True, text=True, cwd=os.path.dirname(path))
+            if proc.returncode != 0:
+                error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit code {proc.returncode}"
+                break
+            timings.append(float(proc.stdout.strip().splitlines()[-1]))
+
+            # Lines look like "import time:   self [us] | cumulative | imported package"
+            imports = []
+            for line in proc.stderr.splitlines():
+                parts = line.split("|")
+                if line.startswith("import time:") and len(parts) == 3 and parts[1].strip().isdigit():
+                    imports.append((int(parts[1]), parts[2].strip()))
+            slowest = [{"module": name, "cumulative_ms": us / 1000} for us, name in sorted(imports, reverse=True)[:top]]
+
+        if error:
+            results[entry_point] = {"error": error}
+            print(f"{entry_point}: failed to import ({error})")
+            continue
+        timings.sort()
+        results[entry_point] = {"import_seconds": timings[len(timings) // 2], "slowest_imports": slowest}
+        print(f"{entry_point}: {results[entry_point]['import_seconds'] * 1000:.1f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every tokenizer in the repository.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="Corpus sizes (documents)")
+    parser.add_argument("--corpus-file", help="Optional text file, one document per line")
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS), help="Subset of backends to run")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic corpus")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON report")
+    parser.add_argument("--cold-start", action="store_true", help="Measure import time of each entry point instead")
+    # Internal: run by measure_rss in a child process
+    parser.add_argument("--rss-probe", choices=sorted(BACKENDS), help=argparse.SUPPRESS)
+    parser.add_argument("--probe-corpus", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.rss_probe:
+        print(json.dumps(rss_probe(args.rss_probe, args.probe_corpus, args.corpus_file, args.seed)))
+        sys.exit(0)
+    if args.cold_start:
+        report = {"cold_start": measure_cold_start()}
+    else:
+        report = run_benchmark(args.sizes, args.corpus_file, args.backends, args.seed)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
@@ -0,0 +1,62 @@
+# Local-first loading of NLTK data and pretrained models shared by the tokenizer scripts.
+
+# Resources are looked up locally and only downloaded on first use, never at import time.
+# Set TOKENIZATION_OFFLINE=1 to disable downloads entirely: missing resources then raise LookupError
+# with the command that installs them.
+
+from functools import lru_cache
+import logging
+import os
+
+OFFLINE = os.environ.get("TOKENIZATION_OFFLINE", "").lower() in ("1", "true", "yes")
+
+# Failed lookups by candidates tuple; lru_cache only remembers successes, so failures are re-raised from here
+# instead of searching (and trying to download) again for every document
+_failed_resources = {}
+
+
+@lru_cache(maxsize=None)
+def ensure_nltk_resource(*candidates):
+    """
+    Make sure one of the NLTK resources in `candidates` (e.g. "tokenizers/punkt_tab") is available locally.
+    The first candidate is downloaded when none is found and offline mode is off. A failure is remembered
+    and raised again on later calls without retrying.
+
+    :param candidates: NLTK resource paths, most preferred first
+    :return: Path of the resource that was found
+    """
+    if candidates in _failed_resources:
+        raise _failed_resources[candidates].with_traceback(None)
+    try:
+        return _find_or_download(candidates)
+    except Exception as e:
+        _failed_resources[candidates] = e
+        raise
+
+
+def _find_or_download(candidates):
+    import nltk
+
+    for resource in candidates:
+        try:
+            return str(nltk.data.find(resource))
+        except LookupError:
+            continue
+
+    package = candidates[0].rstrip("/").split("/")[-1]
+    if OFFLINE:
+        raise LookupError(f"NLTK resource '{candidates[0]}' is not installed and offline mode is on. "
+                          f"Install it with: python -m nltk.downloader {package}")
+
+    logging.info(f"NLTK resource '{candidates[0]}' not found locally. Downloading '{package}'.")
+    if not nltk.download(package, quiet=True):
+        raise LookupError(f"Could not download NLTK resource '{package}'.")
+    return str(nltk.data.find(candidates[0]))
+
+
+def ensure_punkt():
+    """
+    Make sure the Punkt sentence model used by word_tokenize/sent_tokenize is available locally.
+    """
+    # NLTK >= 3.8.2 reads punkt_tab; older releases read the pickled punkt model
+    return ensure_nltk_resource("tokenizers/punkt_tab", "tokenizers/punkt")
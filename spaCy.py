@@ -2,8 +2,61 @@
 
 # Handles complex tokenization issues, such as splitting contractions and handling special cases like URLs and emails.
 
-import spacy
-nlp = spacy.load("en_core_web_sm")
-doc = nlp("This is a sentence.")
-tokens = [token.text for token in doc]
-print(tokens)
+from functools import lru_cache
+from itertools import islice
+import time
+from tokenization_metrics import metrics
+
+@lru_cache(maxsize=None)
+def load_nlp(model="en_core_web_sm", tokenizer_only=False):
+    # spaCy and the model are loaded on first use, once per process
+    import spacy
+    nlp = spacy.load(model)
+    if tokenizer_only:
+        # Every component after the tokenizer (tagger, parser, NER, ...) is skipped by nlp() and nlp.pipe()
+        nlp.select_pipes(disable=nlp.pipe_names)
+    return nlp
+
+def spacy_tokenize(text, model="en_core_web_sm"):
+    doc = load_nlp(model)(text)
+    return [token.text for token in doc]
+
+class SpacyTokenizerService:
+    """
+    Long-lived spaCy tokenizer: the pipeline is loaded once per worker with every component beyond the
+    tokenizer disabled, and documents are processed in batches through nlp.pipe.
+    """
+    def __init__(self, model="en_core_web_sm", batch_size=1000, n_process=1):
+        self.nlp = load_nlp(model, tokenizer_only=True)
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.metrics_name = f"spacy:{model}"
+
+    def tokenize_batch(self, texts):
+        """
+        Tokenize a list or stream of texts, yielding one token list per text in input order.
+        """
+        # One nlp.pipe stream (so worker processes are started once); metrics are recorded per `batch_size`
+        # documents and only time spent inside the pipe is counted, not the caller's work between yields
+        docs = self.nlp.pipe(texts, batch_size=self.batch_size, n_process=self.n_process)
+        while True:
+            start = time.perf_counter()
+            results = [[token.text for token in doc] for doc in islice(docs, self.batch_size)]
+            if not results:
+                break
+            metrics.record(self.metrics_name, sum(map(len, results)), time.perf_counter() - start, len(results))
+            yield from results
+
+    def stats(self):
+        """
+        Documents, tokens and throughput processed by this model so far.
+        """
+        return metrics.throughput(self.metrics_name)
+
+if __name__ == "__main__":
+    tokens = spacy_tokenize("This is a sentence.")
+    print(tokens)
+
+    service = SpacyTokenizerService(batch_size=256)
+    results = list(service.tokenize_batch(["This is a sentence."] * 1000))
+    print(results[0], service.stats())
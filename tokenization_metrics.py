@@ -0,0 +1,104 @@
+# Lightweight instrumentation for the tokenization helpers in this repository.
+
+# Counts documents, tokens, errors and cumulative time per tokenizer function instead of logging every document.
+# Read the counters with `metrics.snapshot()` or dump them periodically with `metrics.start_periodic_dump()`.
+
+from collections import defaultdict
+from functools import wraps
+import json
+import logging
+import threading
+import time
+
+
+class TokenizerMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {"documents": 0, "tokens": 0, "errors": 0, "seconds": 0.0})
+        self._dump_thread = None
+        self._dump_stop = threading.Event()
+
+    def record(self, name, tokens=0, seconds=0.0, documents=1):
+        """
+        Record processed documents for `name` (one by default, or a whole batch).
+        """
+        with self._lock:
+            stats = self._stats[name]
+            stats["documents"] += documents
+            stats["tokens"] += tokens
+            stats["seconds"] += seconds
+
+    def record_error(self, name):
+        """
+        Record one failed document for `name`.
+        """
+        with self._lock:
+            self._stats[name]["errors"] += 1
+
+    def snapshot(self):
+        """
+        Return a copy of the counters as {name: {documents, tokens, errors, seconds}}.
+        """
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def throughput(self, name):
+        """
+        Return the counters of `name` plus docs_per_sec and tokens_per_sec over the recorded seconds.
+        """
+        stats = self.snapshot().get(name, {"documents": 0, "tokens": 0, "errors": 0, "seconds": 0.0})
+        seconds = stats["seconds"] or float("inf")
+        return dict(stats, docs_per_sec=stats["documents"] / seconds, tokens_per_sec=stats["tokens"] / seconds)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def start_periodic_dump(self, interval=60.0, path=None):
+        """
+        Dump a snapshot every `interval` seconds from a daemon thread, to `path` as JSON or to the log at INFO.
+        """
+        if self._dump_thread is not None:
+            return
+        self._dump_stop.clear()
+
+        def dump_loop():
+            while not self._dump_stop.wait(interval):
+                self.dump(path)
+
+        self._dump_thread = threading.Thread(target=dump_loop, name="tokenizer-metrics-dump", daemon=True)
+        self._dump_thread.start()
+
+    def stop_periodic_dump(self):
+        if self._dump_thread is None:
+            return
+        self._dump_stop.set()
+        self._dump_thread.join()
+        self._dump_thread = None
+
+    def dump(self, path=None):
+        snapshot = self.snapshot()
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=2)
+        else:
+            logging.info("Tokenizer metrics: %s", json.dumps(snapshot))
+
+
+# Process-wide registry shared by all instrumented functions
+metrics = TokenizerMetrics()
+
+
+def instrumented(name):
+    """
+    Decorator counting documents, tokens (len of the result) and time spent in a tokenizer function.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            metrics.record(name, len(result), time.perf_counter() - start)
+            return result
+        return wrapper
+    return decorator